@@ -5,9 +5,15 @@ import base64
 from config import Config
 from modules.link_budget import LinkBudgetCalculator
 from modules.modulation import Modulator
-from modules.channel import SatelliteChannel
-from modules.error_correction import ErrorCorrection
 from modules.visualization import Visualizer
+from modules.jobs import create_job_service, FINISHED
+from modules.orbit import PassSimulator
+from modules.pulse_shaping import spectrum, occupied_bandwidth
+from modules.density import ConstellationHistogram
+from modules.cache import ResultCache
+from modules.store import ResultStore
+from modules.profiling import Profiler
+from modules.acm import create_acm, required_ebn0, esn0_from_ebn0
 
 # Set page configuration
 st.set_page_config(
@@ -47,6 +53,59 @@ def display_image_from_base64(base64_string):
     """Display base64 encoded image in Streamlit"""
     st.markdown(f'<img src="{base64_string}" style="max-width:100%;">', unsafe_allow_html=True)
 
+def stored_run_label(run):
+    """Short description of a stored sweep for the selection box"""
+    config = run['config']
+    started = time.strftime("%Y-%m-%d %H:%M", time.localtime(run['started']))
+    return f"{config['MODULATION_SCHEME']} {config['FEC_TYPE']} r={config['CODING_RATE']} seed={config['SEED']} ({started})"
+
+@st.cache_resource
+def get_result_cache():
+    """Stage result cache shared by every rerun and session of the app"""
+    config = Config()
+    return ResultCache(max_entries=config.CACHE_MAX_ENTRIES, max_bytes=config.CACHE_MAX_BYTES)
+
+@st.cache_resource
+def get_job_service():
+    """Background simulation service shared by every session of the app"""
+    return create_job_service(Config())
+
+def run_job(kind, config, **options):
+    """Submit a job to the service and show its progress until it finishes
+    
+    A rerun while the job is still going re-attaches to it rather than
+    starting it again. Returns the finished Job.
+    """
+    service = get_job_service()
+    job_id = service.submit(kind, config, **options)
+    progress = st.progress(0.0)
+    partial = st.empty()
+    while True:
+        snapshot = service.wait(job_id, timeout=0.25)
+        progress.progress(snapshot['progress'], text=f"{kind.capitalize()} job {job_id}: {snapshot['state']}")
+        if snapshot['partial'] is not None:
+            partial.table({'SNR (dB)': snapshot['partial']['snr_db'], 'BER': snapshot['partial']['ber'],
+                           'Errors': snapshot['partial']['errors'], 'Bits': snapshot['partial']['bits']})
+        if snapshot['state'] in FINISHED:
+            break
+    progress.empty()
+    partial.empty()
+    job = service.collect(job_id)
+    if job.state != "done":
+        raise RuntimeError(job.error or f"{kind} job {job.state}")
+    return job
+
+def run_chain_job(config, store_root, profiler):
+    """Chain result from the job service, with its stage timings added to profiler"""
+    job = run_job("simulation", config, store=store_root, profile=profiler.enabled, memory=profiler.memory)
+    profiler.records.extend(job.records)
+    return job.result
+
+@st.cache_resource
+def get_result_store(root):
+    """On-disk store of sweep and chain results under root"""
+    return ResultStore(root)
+
 def main():
     # Header
     st.markdown('<h1 class="main-header">🛰️ Satellite Downlink Simulator</h1>', unsafe_allow_html=True)
@@ -84,17 +143,50 @@ def main():
         atmospheric_loss = st.slider("Atmospheric Loss (dB)", 0.1, 5.0, 0.5, 0.1)
         rain_margin = st.slider("Rain Margin (dB)", 0.0, 10.0, 3.0, 0.5)
         
+        # Pass simulation parameters
+        st.subheader("Pass Simulation")
+        run_pass = st.checkbox("Simulate LEO/MEO pass", value=False)
+        orbit_altitude = st.slider("Orbit Altitude (km)", 300.0, 20000.0, 500.0, 50.0) * 1e3
+        orbit_inclination = st.slider("Orbit Inclination (deg)", 0.0, 180.0, 97.4, 0.1)
+        ground_latitude = st.slider("Ground Station Latitude (deg)", -90.0, 90.0, 52.0, 0.5)
+        min_elevation = st.slider("Minimum Elevation (deg)", 0.0, 45.0, 10.0, 1.0)
+        acm_hysteresis = st.slider("ACM Hysteresis (dB)", 0.0, 3.0, 0.5, 0.1)
+        
         # Modulation and coding
         st.subheader("Modulation and Coding")
-        modulation_scheme = st.selectbox("Modulation Scheme", ["BPSK", "QPSK"])
+        modulation_scheme = st.selectbox("Modulation Scheme", ["BPSK", "QPSK", "8PSK", "16APSK", "32APSK"])
         symbol_rate = st.slider("Symbol Rate (Msymbols/s)", 1.0, 100.0, 25.0, 1.0) * 1e6
+        pulse_shaping = st.checkbox("RRC pulse shaping", value=False)
+        rolloff_factor = st.slider("Roll-off Factor", 0.05, 1.0, 0.35, 0.05)
         coding_rate = st.slider("Coding Rate", 0.1, 1.0, 0.75, 0.05)
-        fec_type = st.selectbox("FEC Type", ["Repetition", "None"])
+        fec_type = st.selectbox("FEC Type", ["Repetition", "Convolutional", "LDPC", "None"])
+        soft_decision = st.checkbox("Soft-decision decoding (LLR)", value=True)
         
         # Simulation parameters
         st.subheader("Simulation Parameters")
         num_bits = st.slider("Number of Bits", 100, 5000, 1000, 100)
         snr_db = st.slider("SNR (dB)", 0.0, 20.0, 10.0, 0.5)
+        constellation_view = st.selectbox("Constellation Display", ["Density", "Scatter"])
+        accumulate_density = st.checkbox("Accumulate density across runs", value=False)
+        profile_stages = st.checkbox("Profile stages", value=False)
+        profile_memory = st.checkbox("Track peak allocations (slower)", value=False)
+        
+        # BER sweep parameters
+        run_sweep = st.checkbox("Run BER vs SNR sweep", value=False)
+        sweep_range = st.slider("Sweep SNR Range (dB)", 0.0, 20.0, (0.0, 12.0), 1.0)
+        target_errors = st.slider("Target Errors per Point", 10, 1000, 100, 10)
+        max_bits = st.select_slider("Bit Budget per Point", [10**4, 10**5, 10**6, 10**7], 10**6)
+        seed = st.number_input("Random Seed", min_value=0, value=0, step=1)
+        
+        # On-disk result store
+        st.subheader("Result Store")
+        persist_results = st.checkbox("Persist and resume results on disk", value=False)
+        stored_sweep = None
+        # The store directory is only created once persistence is switched on
+        if persist_results:
+            stored_sweeps = get_result_store(Config().RESULT_STORE_DIR).runs("sweep")
+            stored_sweep = st.selectbox("Show Stored Sweep", [None] + stored_sweeps,
+                                        format_func=lambda run: "None" if run is None else stored_run_label(run))
         
         # Run simulation button
         if st.button("Run Simulation", type="primary"):
@@ -111,77 +203,180 @@ def main():
     config.DISTANCE = distance_value
     config.ATMOSPHERIC_LOSS = atmospheric_loss
     config.RAIN_MARGIN = rain_margin
+    config.ORBIT_ALTITUDE = orbit_altitude
+    config.ORBIT_INCLINATION = orbit_inclination
+    config.GROUND_LATITUDE = ground_latitude
+    config.MIN_ELEVATION = min_elevation
+    config.ACM_HYSTERESIS_DB = acm_hysteresis
     config.MODULATION_SCHEME = modulation_scheme
     config.SYMBOL_RATE = symbol_rate
+    config.PULSE_SHAPING = pulse_shaping
+    config.ROLLOFF_FACTOR = rolloff_factor
     config.CODING_RATE = coding_rate
     config.FEC_TYPE = fec_type
+    config.SOFT_DECISION = soft_decision
     config.NUM_BITS = num_bits
     config.SNR_DB = snr_db
+    config.SWEEP_SNR_DB = list(np.arange(sweep_range[0], sweep_range[1] + 1.0, 1.0))
+    config.TARGET_ERRORS = target_errors
+    config.MAX_BITS = max_bits
+    config.SEED = int(seed)
+    store_root = config.RESULT_STORE_DIR if persist_results else None
+    
+    # Stored curves are memory-mapped straight from disk, without simulating
+    if stored_sweep is not None:
+        st.markdown('<div class="sub-header">Stored BER Curve</div>', unsafe_allow_html=True)
+        stored = get_result_store(config.RESULT_STORE_DIR).load("sweep", stored_sweep['key'])
+        display_image_from_base64(Visualizer().plot_ber_vs_snr(stored['snr_db'], stored['ber'], stored['theoretical_ber']))
     
     if st.session_state.run_simulation:
         try:
-            # Initialize components
-            link_budget = LinkBudgetCalculator(config)
+            # Each stage is cached under a hash of only the Config fields it reads,
+            # so a rerun recomputes and re-renders just the stages that changed
+            cache = get_result_cache()
+            # Stages computed on this rerun are timed; cached ones do not appear
+            profiler = Profiler(enabled=profile_stages, memory=profile_memory)
+            visualizer = profiler.wrap(Visualizer())
             modulator = Modulator(config.MODULATION_SCHEME)
-            channel = SatelliteChannel(snr_db=config.SNR_DB)
-            visualizer = Visualizer()
-            
-            if config.FEC_TYPE == "Repetition":
-                fec = ErrorCorrection(coding_rate=config.CODING_RATE)
-            else:
-                fec = ErrorCorrection(coding_rate=1.0)
             
             # Calculate link budget
             st.markdown('<div class="sub-header">Link Budget Analysis</div>', unsafe_allow_html=True)
             
+            # Evaluate every link budget term once
+            required = required_ebn0(config)
+            budget_key = cache.key("link_budget", config)
+            budget = cache.get_or_compute(
+                budget_key, lambda: profiler.wrap(LinkBudgetCalculator(config)).calculate_batch(required_ebn0=required))
+            
             col1, col2, col3, col4 = st.columns(4)
-            with col1: st.metric("EIRP", f"{link_budget.calculate_eirp():.2f} dBW")
-            with col2: st.metric("Path Loss", f"{link_budget.calculate_free_space_loss():.2f} dB")
-            with col3: st.metric("Received Power", f"{link_budget.calculate_received_power():.2f} dBW")
-            with col4: st.metric("C/N₀", f"{link_budget.calculate_cn0():.2f} dB-Hz")
+            with col1: st.metric("EIRP", f"{budget['eirp']:.2f} dBW")
+            with col2: st.metric("Path Loss", f"{budget['free_space_loss']:.2f} dB")
+            with col3: st.metric("Received Power", f"{budget['received_power']:.2f} dBW")
+            with col4: st.metric("C/N₀", f"{budget['cn0']:.2f} dB-Hz")
             
             col5, col6, col7, col8 = st.columns(4)
-            with col5: st.metric("Eb/N₀", f"{link_budget.calculate_ebn0():.2f} dB")
-            with col6: 
-                required_ebn0 = 9.6 if config.MODULATION_SCHEME == "QPSK" else 12.0
-                margin = link_budget.calculate_link_margin(required_ebn0)
-                st.metric("Link Margin", f"{margin:.2f} dB")
+            with col5: st.metric("Eb/N₀", f"{budget['ebn0']:.2f} dB")
+            with col6: st.metric("Link Margin", f"{budget['link_margin']:.2f} dB")
             
             # Link budget visualization
             link_params = {
-                'EIRP': link_budget.calculate_eirp(),
-                'Path Loss': -link_budget.calculate_free_space_loss(),
-                'Rx Power': link_budget.calculate_received_power(),
-                'C/N₀': link_budget.calculate_cn0(),
-                'Eb/N₀': link_budget.calculate_ebn0()
+                'EIRP': float(budget['eirp']),
+                'Path Loss': -float(budget['free_space_loss']),
+                'Rx Power': float(budget['received_power']),
+                'C/N₀': float(budget['cn0']),
+                'Eb/N₀': float(budget['ebn0'])
             }
             
             st.markdown("### Link Budget Components")
-            budget_img = visualizer.plot_link_budget(link_params)
+            budget_img = cache.get_or_compute(budget_key + ("plot",), lambda: visualizer.plot_link_budget(link_params))
             display_image_from_base64(budget_img)
             
+            # Time-varying link budget over a pass
+            if run_pass:
+                st.markdown('<div class="sub-header">Pass Link Budget</div>', unsafe_allow_html=True)
+                pass_key = cache.key("pass", config)
+                pass_results = cache.get_or_compute(
+                    pass_key, lambda: profiler.wrap(PassSimulator(config)).simulate(required_ebn0=required))
+                
+                col12, col13, col14, col15 = st.columns(4)
+                with col12: st.metric("Min Slant Range", f"{pass_results['slant_range'].min() / 1e3:.0f} km")
+                with col13: st.metric("Visible Time", f"{pass_results['visible_time'] / 60:.1f} min")
+                with col14: st.metric("Usable Time", f"{pass_results['usable_time'] / 60:.1f} min")
+                with col15: st.metric("Data Volume", f"{pass_results['data_volume'] / 8e9:.2f} GB")
+                
+                pass_img = cache.get_or_compute(pass_key + ("plot",), lambda: visualizer.plot_pass(pass_results))
+                display_image_from_base64(pass_img)
+                
+                # MODCOD chosen each second from the pass Es/N0, against the fixed MODCOD above
+                visible = pass_results['visible']
+                acm = cache.get_or_compute(pass_key + ("acm",), lambda: create_acm(config).run(
+                    esn0_from_ebn0(pass_results['ebn0'][visible], config.MODULATION_SCHEME), config.SYMBOL_RATE, 1.0))
+                col20, col21, col22, col23 = st.columns(4)
+                with col20: st.metric("ACM Mean Throughput", f"{acm['throughput'] / 1e6:.1f} Mbit/s")
+                with col21: st.metric("ACM Outage", f"{acm['outage'] * 100:.1f} %")
+                with col22: st.metric("ACM Data Volume", f"{acm['data_volume'] / 8e9:.2f} GB")
+                with col23: st.metric("MODCOD Switches", acm['switches'])
+                
+                acm_img = cache.get_or_compute(pass_key + ("acm", "plot"), lambda: visualizer.plot_acm(
+                    pass_results['time'][visible], esn0_from_ebn0(pass_results['ebn0'][visible], config.MODULATION_SCHEME), acm))
+                display_image_from_base64(acm_img)
+            
             # Communication chain simulation
             st.markdown('<div class="sub-header">Communication Chain Simulation</div>', unsafe_allow_html=True)
             
-            # Generate test data
-            data_bits = np.random.randint(0, 2, config.NUM_BITS)
-            encoded_bits = fec.encode(data_bits)
-            symbols = modulator.modulate(encoded_bits)
-            received_symbols = channel.simulate_channel(symbols)
-            received_bits = modulator.demodulate(received_symbols)
-            decoded_bits = fec.decode(received_bits[:len(encoded_bits)])
-            ber = fec.calculate_ber(data_bits, decoded_bits)
+            chain_key = cache.key("simulation", config)
+            chain = cache.get_or_compute(chain_key, lambda: run_chain_job(config, store_root, profiler))
+            symbols, received_symbols = chain['symbols'], chain['received_symbols']
             
             col9, col10, col11 = st.columns(3)
             with col9: st.metric("Original Bits", config.NUM_BITS)
-            with col10: st.metric("Bit Errors", np.sum(data_bits != decoded_bits))
-            with col11: st.metric("Bit Error Rate", f"{ber:.6f}")
+            with col10: st.metric("Bit Errors", chain['errors'])
+            with col11: st.metric("Bit Error Rate", f"{chain['ber']:.6f}")
+            
+            if chain['ldpc_stats'] is not None:
+                col16, col17 = st.columns(2)
+                with col16: st.metric("LDPC Avg. Iterations", f"{chain['ldpc_stats']['average_iterations']:.1f}")
+                with col17: st.metric("LDPC Decode Throughput", f"{chain['ldpc_stats']['throughput'] / 1e6:.2f} Mbit/s")
             
             # Constellation diagram
             st.markdown("### Constellation Diagram")
-            constellation_img = visualizer.plot_comparison_constellation(symbols[:200], received_symbols[:200])
+            if constellation_view == "Density" and accumulate_density:
+                # Histogram of every received symbol, kept across reruns with the same scheme and SNR;
+                # a cached chain result is only added once, so reruns do not double-count it
+                density_key = (config.MODULATION_SCHEME, config.SNR_DB)
+                if ('constellation_histogram' not in st.session_state
+                        or st.session_state.constellation_key != density_key):
+                    st.session_state.constellation_histogram = ConstellationHistogram()
+                    st.session_state.constellation_key = density_key
+                    st.session_state.constellation_sources = set()
+                histogram = st.session_state.constellation_histogram
+                if chain_key not in st.session_state.constellation_sources:
+                    histogram.update(received_symbols)
+                    st.session_state.constellation_sources.add(chain_key)
+                constellation_img = visualizer.plot_comparison_density(modulator.constellation, histogram)
+            elif constellation_view == "Density":
+                constellation_img = cache.get_or_compute(chain_key + ("density",), lambda: visualizer.plot_comparison_density(
+                    modulator.constellation, ConstellationHistogram().update(received_symbols)))
+            else:
+                constellation_img = cache.get_or_compute(chain_key + ("scatter",), lambda: visualizer.plot_comparison_constellation(
+                    symbols[:200], received_symbols[:200]))
             display_image_from_base64(constellation_img)
             
+            # Spectrum of the pulse-shaped signal
+            if config.PULSE_SHAPING:
+                st.markdown("### Transmit Spectrum")
+                sample_rate = config.SYMBOL_RATE * config.SAMPLES_PER_SYMBOL
+                freqs, psd = spectrum(chain['tx_samples'], sample_rate)
+                obw = occupied_bandwidth(freqs, psd)
+                
+                col18, col19 = st.columns(2)
+                with col18: st.metric("99% Occupied Bandwidth", f"{obw / 1e6:.2f} MHz")
+                with col19: st.metric("Nominal (1+α)·Rs", f"{config.SYMBOL_RATE * (1 + config.ROLLOFF_FACTOR) / 1e6:.2f} MHz")
+                
+                # The axes are scaled by the symbol rate, which the chain key leaves out
+                spectrum_img = cache.get_or_compute(chain_key + ("spectrum", config.SYMBOL_RATE),
+                                                    lambda: visualizer.plot_spectrum(freqs, psd, config.SYMBOL_RATE, obw))
+                display_image_from_base64(spectrum_img)
+            
+            # BER vs SNR sweep
+            if run_sweep:
+                st.markdown('<div class="sub-header">BER vs SNR Sweep</div>', unsafe_allow_html=True)
+                sweep_key = cache.key("sweep", config)
+                results = cache.get_or_compute(sweep_key, lambda: run_job("sweep", config, store=store_root).result)
+                ber_img = cache.get_or_compute(sweep_key + ("plot",), lambda: visualizer.plot_ber_vs_snr(
+                    results['snr_db'], results['ber'], results['theoretical_ber']))
+                display_image_from_base64(ber_img)
+            
+            # Per-stage timings of this rerun
+            if profile_stages:
+                with st.expander("Stage Profile", expanded=False):
+                    if profiler.records:
+                        st.table(profiler.summary())
+                        st.download_button("Download JSON trace", profiler.trace(),
+                                           file_name="downlink_trace.json", mime="application/json")
+                    else:
+                        st.write("Every stage came from the cache on this rerun.")
+            
         except Exception as e:
             st.error(f"An error occurred: {str(e)}")
     else:
@@ -0,0 +1,198 @@
+"""Throughput and peak-memory benchmarks for every stage of the downlink chain
+
+    python benchmark.py                          # all stages, 10^3 .. 10^6 bits
+    python benchmark.py --sizes 1e3 1e7 --output bench.json
+    python benchmark.py --save-baseline baseline.json
+    python benchmark.py --baseline baseline.json --threshold 0.2
+
+With --baseline the run exits with status 1 when any stage/size pair is
+more than --threshold (fractional) slower than the stored baseline.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from config import Config
+from modules.link_budget import LinkBudgetCalculator
+from modules.modulation import Modulator
+from modules.channel import SatelliteChannel
+from modules.error_correction import create_fec
+from modules.simulation import run_chain
+
+
+def _modulate(config, n, rng):
+    modulator = Modulator(config.MODULATION_SCHEME)
+    bits = rng.integers(0, 2, n)
+    return lambda: modulator.modulate(bits)
+
+
+def _demodulate(config, n, rng):
+    modulator = Modulator(config.MODULATION_SCHEME)
+    symbols = SatelliteChannel(config.SNR_DB, rng=rng).simulate_channel(modulator.modulate(rng.integers(0, 2, n)))
+    return lambda: modulator.demodulate(symbols)
+
+
+def _demodulate_soft(config, n, rng):
+    modulator = Modulator(config.MODULATION_SCHEME)
+    channel = SatelliteChannel(config.SNR_DB, rng=rng)
+    symbols = channel.simulate_channel(modulator.modulate(rng.integers(0, 2, n)))
+    return lambda: modulator.demodulate_soft(symbols, channel.noise_variance())
+
+
+def _encode(config, n, rng):
+    fec = create_fec(config)
+    bits = rng.integers(0, 2, n)
+    return lambda: fec.encode(bits)
+
+
+def _decode(config, n, rng):
+    fec = create_fec(config)
+    encoded = fec.encode(rng.integers(0, 2, n))
+    if not config.SOFT_DECISION:
+        return lambda: fec.decode(encoded)
+    llrs = (1 - 2 * encoded) * 4.0 + rng.standard_normal(len(encoded))
+    return lambda: fec.decode_soft(llrs)
+
+
+def _channel(config, n, rng, buffered=False):
+    modulator = Modulator(config.MODULATION_SCHEME)
+    channel = SatelliteChannel(config.SNR_DB, rng=rng, buffered=buffered)
+    symbols = modulator.modulate(rng.integers(0, 2, n))
+    return lambda: channel.simulate_channel(symbols)
+
+
+def _link_budget(config, n, rng):
+    # One link budget evaluation per "bit": a distance sweep of n points
+    calculator = LinkBudgetCalculator(config)
+    distances = rng.uniform(500e3, 36000e3, n)
+    return lambda: calculator.calculate_batch(required_ebn0=9.6, DISTANCE=distances)
+
+
+def _chain(config, n, rng):
+    config.NUM_BITS = n
+    return lambda: run_chain(config)
+
+
+# Stage name -> factory(config, n, rng) returning a zero-argument callable
+STAGES = {
+    "modulate": _modulate,
+    "demodulate": _demodulate,
+    "demodulate_soft": _demodulate_soft,
+    "fec_encode": _encode,
+    "fec_decode": _decode,
+    "channel": _channel,
+    "channel_buffered": lambda config, n, rng: _channel(config, n, rng, buffered=True),
+    "link_budget": _link_budget,
+    "end_to_end": _chain,
+}
+
+
+def measure(run, repeats=5, min_time=0.2):
+    """Best wall time over at least `repeats` calls (more for very fast calls)"""
+    best, total, calls = np.inf, 0.0, 0
+    while calls < repeats or total < min_time:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        calls += 1
+        if total > 10 * max(min_time, 1.0):
+            break
+    return best
+
+
+def peak_memory(run):
+    """Allocation high-water mark of one call, in bytes"""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(config, stages, sizes, repeats=5, seed=0):
+    results = []
+    for stage in stages:
+        for n in sizes:
+            run = STAGES[stage](config, n, np.random.default_rng(seed))
+            seconds = measure(run, repeats)
+            results.append({
+                "stage": stage,
+                "size": n,
+                "seconds": seconds,
+                "mbps": n / seconds / 1e6,
+                "peak_mb": peak_memory(run) / 2**20,
+            })
+            print(f"{stage:18s} {n:>10d}  {results[-1]['mbps']:10.2f} Mbit/s  {results[-1]['peak_mb']:9.2f} MB",
+                  flush=True)
+    return results
+
+
+def regressions(results, baseline, threshold):
+    """Stage/size pairs slower than the baseline by more than threshold"""
+    reference = {(r["stage"], r["size"]): r["mbps"] for r in baseline["results"]}
+    slow = []
+    for r in results:
+        expected = reference.get((r["stage"], r["size"]))
+        if expected is not None and r["mbps"] < expected * (1 - threshold):
+            slow.append((r["stage"], r["size"], r["mbps"], expected))
+    return slow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e3, 1e4, 1e5, 1e6],
+                        help="bit counts per call (10^7 is supported but slow for LDPC)")
+    parser.add_argument("--modulation", default=None)
+    parser.add_argument("--fec", default=None, help="FEC_TYPE to benchmark")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    parser.add_argument("--baseline", default=None, help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed fractional throughput drop against the baseline")
+    parser.add_argument("--save-baseline", default=None, help="write these results as the new baseline")
+    args = parser.parse_args(argv)
+    
+    config = Config()
+    config.SEED = 0
+    if args.modulation:
+        config.MODULATION_SCHEME = args.modulation
+    if args.fec:
+        config.FEC_TYPE = args.fec
+    
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "modulation": config.MODULATION_SCHEME,
+            "fec": config.FEC_TYPE,
+            "coding_rate": config.CODING_RATE,
+            "time": time.time(),
+        },
+        "results": run_benchmarks(config, args.stages, [int(n) for n in args.sizes], args.repeats),
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            slow = regressions(report["results"], json.load(f), args.threshold)
+        for stage, n, mbps, expected in slow:
+            print(f"REGRESSION {stage} at {n} bits: {mbps:.2f} Mbit/s vs baseline {expected:.2f}")
+        if slow:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
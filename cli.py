@@ -0,0 +1,191 @@
+"""Headless batch runner for scenario files
+
+    python cli.py scenarios/ku_leo.json --jobs link_budget sweep --format csv
+    python cli.py runs.yaml --output-dir out --format npz --plot
+
+A scenario file holds one scenario or a list of them:
+
+    {"name": "ku_leo", "config": {"MODULATION_SCHEME": "8PSK", "SNR_DB": 8},
+     "jobs": ["link_budget", "chain", "sweep", "pass", "acm"]}
+
+"config" overrides Config attributes by name; "jobs" may be left out and
+given with --jobs instead. A "network" job simulates every link of a
+"links" mapping in one batch, e.g. {"DISTANCE": [36e6, 38e6],
+"GROUND_ANTENNA_GAIN": [45, 50]} or {"SNR_DB": [2, 4, 6]}. Matplotlib is imported only with --plot, and
+Streamlit never, so a headless run starts in a fraction of a second.
+"""
+import argparse
+import base64
+import csv
+import json
+import os
+import sys
+import numpy as np
+from config import Config
+from modules.link_budget import LinkBudgetCalculator
+from modules.simulation import BERSimulator, run_chain
+from modules.orbit import PassSimulator
+from modules.acm import create_acm, required_ebn0, esn0_from_ebn0
+from modules.network import LinkBatchSimulator
+from modules.importance import create_importance_sampler
+
+JOBS = ("link_budget", "chain", "sweep", "pass", "acm", "network", "importance")
+
+
+def load_scenarios(path):
+    """List of scenario dicts from a JSON or YAML file"""
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML is needed for YAML scenarios (pip install pyyaml)")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    scenarios = data if isinstance(data, list) else [data]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for i, scenario in enumerate(scenarios):
+        scenario.setdefault("name", stem if len(scenarios) == 1 else f"{stem}_{i}")
+    return scenarios
+
+
+def build_config(overrides):
+    """Config with the given attributes replaced; unknown names are an error"""
+    config = Config()
+    unknown = set(overrides) - set(vars(config))
+    if unknown:
+        raise ValueError(f"Unknown Config parameters: {sorted(unknown)}")
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return config
+
+
+def run_job(job, config, links=None):
+    """Run one job and return its results as a dict of scalars and arrays
+    
+    links holds the per-link parameter lists of a "network" job.
+    """
+    required = required_ebn0(config)
+    if job == "link_budget":
+        budget = LinkBudgetCalculator(config).calculate_batch(required_ebn0=required)
+        return {name: budget[name] for name in budget.dtype.names}
+    if job == "chain":
+        return {name: value for name, value in run_chain(config).items() if value is not None}
+    if job == "sweep":
+        return BERSimulator(config).sweep(config.SWEEP_SNR_DB)
+    if job == "pass":
+        return PassSimulator(config).simulate(required_ebn0=required)
+    if job == "acm":
+        pass_results = PassSimulator(config).simulate(required_ebn0=required)
+        # Only the visible part of the pass, as the app reports it
+        visible = pass_results['visible']
+        esn0 = esn0_from_ebn0(pass_results['ebn0'][visible], config.MODULATION_SCHEME)
+        results = create_acm(config).run(esn0, config.SYMBOL_RATE, frame_duration=1.0)
+        results['time'], results['esn0'] = pass_results['time'][visible], esn0
+        return results
+    if job == "importance":
+        return create_importance_sampler(config).sweep(config.SWEEP_SNR_DB, config.IS_FRAMES)
+    if job == "network":
+        links = dict(links or {})
+        snr_db = links.pop("SNR_DB", None)
+        links = {name: np.asarray(values, dtype=float) for name, values in links.items()}
+        return LinkBatchSimulator(config).simulate(config.NUM_BITS, snr_db=snr_db, **links)
+    raise ValueError(f"Unknown job {job!r}; expected one of {JOBS}")
+
+
+def write_csv(path, results):
+    """Scalars as one row, or equal-length 1-D arrays as columns (scalars repeated)
+    
+    Complex arrays are split into _re and _im columns; arrays of another
+    length than the longest one are left out (use --format npz for those).
+    """
+    columns = {}
+    for name, value in results.items():
+        if isinstance(value, dict):
+            columns.update({f"{name}_{key}": v for key, v in value.items()})
+        else:
+            columns[name] = value
+    length = max([np.size(v) for v in columns.values() if np.ndim(v) > 0] or [1])
+    table = {}
+    for name, value in columns.items():
+        value = np.asarray(value)
+        if value.ndim == 0:
+            value = np.full(length, value)
+        if value.ndim != 1 or len(value) != length:
+            continue
+        if np.iscomplexobj(value):
+            table[name + "_re"], table[name + "_im"] = value.real, value.imag
+        else:
+            table[name] = value
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(table)
+        writer.writerows(zip(*[column.tolist() for column in table.values()]))
+
+
+def write_npz(path, results):
+    arrays = {}
+    for name, value in results.items():
+        if isinstance(value, dict):
+            arrays.update({f"{name}_{key}": np.asarray(v) for key, v in value.items()})
+        else:
+            arrays[name] = np.asarray(value)
+    np.savez(path, **arrays)
+
+
+def write_plot(path, job, results):
+    """Save the job's plot as PNG; this is the only place Matplotlib gets imported"""
+    from modules.visualization import Visualizer
+    visualizer = Visualizer()
+    if job in ("sweep", "importance"):
+        image = visualizer.plot_ber_vs_snr(results['snr_db'], results['ber'], results['theoretical_ber'])
+    elif job == "acm":
+        image = visualizer.plot_acm(results['time'], results['esn0'], results)
+    elif job == "pass":
+        image = visualizer.plot_pass(results)
+    elif job == "network":
+        image = visualizer.plot_network(results)
+    elif job == "chain":
+        image = visualizer.plot_comparison_constellation(results['symbols'][:200], results['received_symbols'][:200])
+    else:
+        image = visualizer.plot_link_budget({
+            'EIRP': float(results['eirp']),
+            'Path Loss': -float(results['free_space_loss']),
+            'Rx Power': float(results['received_power']),
+            'C/N₀': float(results['cn0']),
+            'Eb/N₀': float(results['ebn0'])
+        })
+    with open(path, "wb") as f:
+        f.write(base64.b64decode(image.split(",", 1)[1]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run downlink scenarios without the Streamlit app")
+    parser.add_argument("scenarios", nargs="+", help="JSON or YAML scenario files")
+    parser.add_argument("--jobs", nargs="+", choices=JOBS, default=None,
+                        help="jobs for scenarios that do not list their own (default: link_budget)")
+    parser.add_argument("--output-dir", default="results")
+    parser.add_argument("--format", choices=("csv", "npz"), default="csv")
+    parser.add_argument("--plot", action="store_true", help="also write a PNG per job")
+    args = parser.parse_args(argv)
+    
+    os.makedirs(args.output_dir, exist_ok=True)
+    for path in args.scenarios:
+        for scenario in load_scenarios(path):
+            config = build_config(scenario.get("config", {}))
+            for job in scenario.get("jobs") or args.jobs or ["link_budget"]:
+                results = run_job(job, config, scenario.get("links"))
+                stem = os.path.join(args.output_dir, f"{scenario['name']}_{job}")
+                if args.format == "csv":
+                    write_csv(stem + ".csv", results)
+                else:
+                    write_npz(stem + ".npz", results)
+                if args.plot:
+                    write_plot(stem + ".png", job, results)
+                print(f"{scenario['name']}: {job} -> {stem}.{args.format}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -16,15 +16,72 @@ class Config:
         self.ATMOSPHERIC_LOSS = 0.5  # dB
         self.RAIN_MARGIN = 3  # dB
         
+        # Time-correlated channel processes (streaming simulation)
+        self.FADING_MODEL = "None"  # "None", "Rician" or "Loo"
+        self.RICIAN_K_DB = 10
+        self.LOO_LOS_MEAN_DB = -0.5
+        self.LOO_LOS_STD_DB = 1.0
+        self.LOO_MULTIPATH_DB = -15
+        self.FADING_CORRELATION_TIME = 1e-3  # seconds (multipath)
+        self.SHADOW_CORRELATION_TIME = 1.0  # seconds (Loo LOS shadowing)
+        self.RAIN_FADE = False
+        self.RAIN_MEDIAN_DB = 1.0
+        self.RAIN_SIGMA_LN = 1.0
+        self.RAIN_CORRELATION_TIME = 3000  # seconds
+        
+        # Orbit and ground station parameters (pass simulation)
+        self.ORBIT_ALTITUDE = 500e3  # meters
+        self.ORBIT_INCLINATION = 97.4  # degrees (sun-synchronous)
+        self.ORBIT_RAAN = None  # degrees; None phases the orbit for an overhead pass
+        self.ORBIT_ARG_LATITUDE = None  # degrees at t = 0
+        self.GROUND_LATITUDE = 52.0  # degrees
+        self.GROUND_LONGITUDE = 0.0  # degrees
+        self.MIN_ELEVATION = 10  # degrees
+        
         # Modulation parameters
         self.MODULATION_SCHEME = "QPSK"
         self.SYMBOL_RATE = 25e6  # symbols/second
         self.ROLLOFF_FACTOR = 0.35
+        self.PULSE_SHAPING = False  # RRC transmit/matched filtering at SAMPLES_PER_SYMBOL
+        self.SAMPLES_PER_SYMBOL = 4
+        self.RRC_SPAN = 10  # filter length in symbols
         
         # Coding parameters
         self.CODING_RATE = 0.75
         self.FEC_TYPE = "Repetition"
+        self.LDPC_BLOCK_LENGTH = 648  # codeword bits
+        self.LDPC_MAX_ITERATIONS = 50
+        self.SOFT_DECISION = True  # Decode from demodulator LLRs instead of hard bits
         
         # Simulation parameters
         self.NUM_BITS = 1000
-        self.SNR_DB = 10
\ No newline at end of file
+        self.SNR_DB = 10
+        
+        # BER sweep parameters
+        self.SWEEP_SNR_DB = [0, 2, 4, 6, 8, 10, 12]
+        self.FRAME_BITS = 10000  # bits per batched frame
+        self.TARGET_ERRORS = 100  # stop a point after this many bit errors
+        self.MAX_BITS = 1000000  # ... or after this many bits
+        self.SEED = None  # None draws fresh entropy; an int makes runs reproducible
+        self.WORKERS = 1  # process-pool size for BER sweeps
+        self.CHANNEL_BUFFERED = False  # complex64 in-place channel with reused buffers
+        
+        # Streamlit result cache
+        self.CACHE_MAX_ENTRIES = 64  # stage results and rendered plots kept across reruns
+        self.CACHE_MAX_BYTES = 256 * 2**20  # ... and their total estimated size
+        self.RESULT_STORE_DIR = "results"  # on-disk store for resumable sweeps and stored chain runs
+        
+        # Adaptive coding and modulation
+        self.ACM_TARGET_BER = 1e-5  # BER the MODCOD thresholds are set for
+        self.ACM_HYSTERESIS_DB = 0.5  # extra Es/N0 needed before switching up
+        self.ACM_MARGIN_DB = 0.0  # safety margin added to every threshold
+        
+        # Background job service used by the app
+        self.JOB_WORKERS = 2  # pool tasks running at once, shared by every job
+        self.JOB_EXECUTOR = "process"  # "process" or "thread"
+        self.JOB_HISTORY = 100  # finished jobs (and results) the service remembers
+        
+        # Importance-sampled BER estimation
+        self.IS_METHOD = "mean"  # "mean" (shift toward neighbours) or "variance" (scaled noise)
+        self.IS_FRAMES = 1000  # biased frames per SNR point
+        self.IS_WINDOW = 32  # symbols biased per coded frame
\ No newline at end of file
@@ -0,0 +1,223 @@
+import numpy as np
+from modules.modulation import CONSTELLATIONS, bits_per_symbol
+from modules.error_correction import PUNCTURE_PATTERNS, ConvolutionalCode, ErrorCorrection
+from modules.simulation import q_function, theoretical_ber
+
+# Approximate gap to the Shannon limit of the short LDPC codes near BER 1e-5
+LDPC_CAPACITY_GAP_DB = 3.0
+
+MODCOD_DTYPE = np.dtype([
+    ("modulation", "U8"), ("fec_type", "U16"), ("coding_rate", float),
+    ("efficiency", float),  # information bits per symbol
+    ("esn0_threshold", float),  # dB
+])
+
+ACM_BLOCK_SIZE = 1 << 15  # frames per hysteresis block
+
+
+def _solve_db(ber_of_db, target_ber, low=-20.0, high=40.0):
+    """Smallest dB value where a decreasing BER curve reaches target_ber (bisection)"""
+    for _ in range(60):
+        middle = (low + high) / 2
+        if ber_of_db(middle) > target_ber:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def fec_rate(fec_type, coding_rate, block_length=648):
+    """Actual code rate create_fec() would give, without building the code"""
+    if fec_type == "Convolutional":
+        return max([r for r in PUNCTURE_PATTERNS if r <= coding_rate + 1e-9], default=1/2)
+    if fec_type == "LDPC":
+        return int(np.clip(round(block_length * coding_rate), 1, block_length - 1)) / block_length
+    if fec_type == "Repetition":
+        return ErrorCorrection(coding_rate).rate
+    return 1.0
+
+
+def required_esn0(modulation, fec_type, coding_rate, target_ber=1e-5, block_length=648):
+    """Nominal Es/N0 (dB) a MODCOD needs to reach target_ber in AWGN
+    
+    Uncoded and soft-combined repetition thresholds are exact. The
+    convolutional code gain is taken from the dominant term of its union
+    bound, B_free Q(sqrt(2 R d_free Eb/N0)) / P, with d_free and B_free
+    taken from the code's own punctured trellis. LDPC thresholds sit a
+    fixed gap above the Shannon limit for the MODCOD's spectral efficiency. These
+    are planning values; ModcodTable.calibrate replaces them with
+    simulated ones.
+    """
+    rate = fec_rate(fec_type, coding_rate, block_length)
+    uncoded = _solve_db(lambda db: theoretical_ber(modulation, db)[0], target_ber)
+    if fec_type == "Convolutional":
+        bpsk = _solve_db(lambda db: q_function(np.sqrt(2 * 10**(db / 10))), target_ber)
+        # P, the puncturing period in information bits, normalizes the path weight
+        period = len(PUNCTURE_PATTERNS[rate][0])
+        distance, weight = ConvolutionalCode(rate).free_distance
+        weight /= period
+        coded = _solve_db(lambda db: weight * q_function(np.sqrt(2 * rate * distance * 10**(db / 10))), target_ber)
+        return uncoded + 10 * np.log10(rate) - (bpsk - coded)
+    if fec_type == "LDPC":
+        efficiency = bits_per_symbol(modulation) * rate
+        return 10 * np.log10(2**efficiency - 1) + LDPC_CAPACITY_GAP_DB
+    # Repetition spreads each bit's energy over 1/rate symbols that are soft-combined
+    return uncoded + 10 * np.log10(rate)
+
+
+def required_ebn0(config, target_ber=None):
+    """Required Eb/N0 of the config's MODCOD in the link budget's convention
+    
+    LinkBudgetCalculator counts Eb per modulated bit (C/N0 over the symbol
+    rate times bits per symbol), so this is the Es/N0 threshold less
+    10 log10(bits per symbol).
+    """
+    target_ber = target_ber if target_ber is not None else config.ACM_TARGET_BER
+    fec_type = config.FEC_TYPE if config.FEC_TYPE in ("Repetition", "Convolutional", "LDPC") else "None"
+    threshold = required_esn0(config.MODULATION_SCHEME, fec_type, config.CODING_RATE, target_ber,
+                              config.LDPC_BLOCK_LENGTH)
+    return threshold - 10 * np.log10(bits_per_symbol(config.MODULATION_SCHEME))
+
+
+class ModcodTable:
+    """MODCODs sorted by Es/N0 threshold, keeping only those that raise the efficiency"""
+    def __init__(self, modcods):
+        modcods = np.sort(np.asarray(modcods, dtype=MODCOD_DTYPE), order=["esn0_threshold", "efficiency"])
+        # A MODCOD that needs more SNR for no more throughput would never be chosen
+        best = np.maximum.accumulate(modcods["efficiency"])
+        keep = np.ones(len(modcods), dtype=bool)
+        keep[1:] = modcods["efficiency"][1:] > best[:-1] + 1e-9
+        self.modcods = modcods[keep]
+    
+    @classmethod
+    def build(cls, modulations=None, fec_types=("None", "Convolutional", "LDPC"),
+              coding_rates=(1/2, 2/3, 3/4, 5/6, 7/8), target_ber=1e-5, block_length=648):
+        """Table over every modulation x FEC x rate combination, with nominal thresholds"""
+        modulations = modulations if modulations is not None else list(CONSTELLATIONS)
+        rows = {}
+        for modulation in modulations:
+            for fec_type in fec_types:
+                for coding_rate in (coding_rates if fec_type != "None" else (1.0,)):
+                    rate = fec_rate(fec_type, coding_rate, block_length)
+                    rows[(modulation, fec_type, rate)] = (
+                        modulation, fec_type, coding_rate, bits_per_symbol(modulation) * rate,
+                        required_esn0(modulation, fec_type, coding_rate, target_ber, block_length))
+        return cls(list(rows.values()))
+    
+    def __len__(self):
+        return len(self.modcods)
+    
+    def names(self):
+        return [f"{m['modulation']} {m['fec_type']} {m['coding_rate']:.3g}" for m in self.modcods]
+    
+    def calibrate(self, config, target_ber=1e-5, snr_db=None):
+        """New table with thresholds read off simulated BER curves
+        
+        Each MODCOD is swept with BERSimulator on a copy of config; the
+        threshold is where log10(BER) crosses target_ber, interpolated
+        between sweep points. MODCODs that never reach it are dropped.
+        """
+        import copy
+        from modules.simulation import BERSimulator
+        snr_db = np.asarray(snr_db if snr_db is not None else np.arange(-4.0, 24.0, 1.0))
+        rows = []
+        for modcod in self.modcods:
+            trial = copy.copy(config)
+            trial.MODULATION_SCHEME = str(modcod["modulation"])
+            trial.FEC_TYPE = str(modcod["fec_type"])
+            trial.CODING_RATE = float(modcod["coding_rate"])
+            ber = BERSimulator(trial).sweep(snr_db)["ber"]
+            below = np.flatnonzero(ber <= target_ber)
+            if len(below) == 0:
+                continue
+            i = below[0]
+            threshold = snr_db[i]
+            if i > 0 and ber[i] > 0:
+                # Interpolate log10 BER between the last point above and the first below
+                y0, y1 = np.log10(ber[i - 1]), np.log10(ber[i])
+                threshold = snr_db[i - 1] + (np.log10(target_ber) - y0) / (y1 - y0) * (snr_db[i] - snr_db[i - 1])
+            row = modcod.copy()
+            row["esn0_threshold"] = threshold
+            rows.append(row)
+        return ModcodTable(rows)
+
+
+class AcmEngine:
+    """Frame-by-frame MODCOD selection from an Es/N0 time series, with hysteresis
+    
+    Each MODCOD level is a Schmitt trigger: it switches on when Es/N0 reaches
+    threshold + margin + hysteresis and off when it drops below threshold +
+    margin, and the highest level that is on is used. A level's state is the
+    direction of its last crossing, found for a whole block of frames at once
+    with a running maximum over crossing indices, so there is no per-frame
+    Python loop. Trigger states carry over between calls, so a long series
+    can be fed in chunks. Frames with no level on are outages (index -1).
+    """
+    def __init__(self, table, hysteresis_db=0.5, margin_db=0.0):
+        self.table = table
+        self.hysteresis_db = hysteresis_db
+        self.margin_db = margin_db
+        self.reset()
+    
+    def reset(self):
+        self.state = None  # per-level trigger state after the last frame
+    
+    def select(self, esn0_db):
+        """MODCOD index per frame (-1 in outage)"""
+        esn0_db = np.asarray(esn0_db, dtype=float)
+        down = self.table.modcods["esn0_threshold"] + self.margin_db
+        up = down + self.hysteresis_db
+        if self.state is None and len(esn0_db) > 0:
+            self.state = esn0_db[0] >= down
+        
+        selected = np.empty(len(esn0_db), dtype=np.int64)
+        for start in range(0, len(esn0_db), ACM_BLOCK_SIZE):
+            x = esn0_db[start:start + ACM_BLOCK_SIZE]
+            rising = x[None, :] >= up[:, None]
+            falling = x[None, :] < down[:, None]
+            # Index of the latest crossing at or before each frame, -1 if none yet
+            frames = np.arange(len(x))
+            last = np.maximum.accumulate(np.where(rising | falling, frames, -1), axis=1)
+            levels = np.arange(len(down))[:, None]
+            state = np.where(last >= 0, rising[levels, np.maximum(last, 0)], self.state[:, None])
+            
+            # Highest level on, or -1
+            on = state[::-1].argmax(axis=0)
+            selected[start:start + len(x)] = np.where(state.any(axis=0), len(down) - 1 - on, -1)
+            self.state = state[:, -1]
+        return selected
+    
+    def run(self, esn0_db, symbol_rate, frame_duration=None):
+        """Select MODCODs over a series and summarize the achieved link
+        
+        Returns a dict with the per-frame MODCOD index and information rate,
+        the mean throughput (bit/s), the outage fraction, the share of time
+        spent on each MODCOD and the number of MODCOD switches. With a
+        frame_duration (s), the delivered data volume is included as well.
+        """
+        selected = self.select(esn0_db)
+        efficiency = np.append(self.table.modcods["efficiency"], 0.0)[selected]
+        rate = efficiency * symbol_rate
+        counts = np.bincount(selected + 1, minlength=len(self.table) + 1)
+        results = {
+            "modcod": selected,
+            "rate": rate,
+            "throughput": rate.mean() if len(rate) else 0.0,
+            "outage": counts[0] / max(len(selected), 1),
+            "usage": counts[1:] / max(len(selected), 1),
+            "switches": int(np.count_nonzero(np.diff(selected))),
+        }
+        if frame_duration is not None:
+            results["data_volume"] = rate.sum() * frame_duration
+        return results
+
+
+def esn0_from_ebn0(ebn0_db, modulation):
+    """Es/N0 of a link budget Eb/N0 series computed for the given modulation"""
+    return np.asarray(ebn0_db) + 10 * np.log10(bits_per_symbol(modulation))
+
+
+def create_acm(config):
+    """ACM engine over the nominal MODCOD table at the config's target BER"""
+    table = ModcodTable.build(target_ber=config.ACM_TARGET_BER, block_length=config.LDPC_BLOCK_LENGTH)
+    return AcmEngine(table, hysteresis_db=config.ACM_HYSTERESIS_DB, margin_db=config.ACM_MARGIN_DB)
\ No newline at end of file
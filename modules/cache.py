@@ -0,0 +1,144 @@
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+from modules.link_budget import LINK_BUDGET_FIELDS
+
+# Config fields each stage depends on; a change anywhere else leaves the stage cached
+SIMULATION_FIELDS = (
+    "MODULATION_SCHEME", "FEC_TYPE", "CODING_RATE", "LDPC_BLOCK_LENGTH", "LDPC_MAX_ITERATIONS",
+    "SOFT_DECISION", "NUM_BITS", "SNR_DB", "SEED", "PULSE_SHAPING", "ROLLOFF_FACTOR",
+    "SAMPLES_PER_SYMBOL", "RRC_SPAN", "CHANNEL_BUFFERED",
+)
+STAGE_FIELDS = {
+    "link_budget": LINK_BUDGET_FIELDS + (
+        "MODULATION_SCHEME", "FEC_TYPE", "CODING_RATE", "LDPC_BLOCK_LENGTH", "ACM_TARGET_BER",
+    ),
+    "pass": LINK_BUDGET_FIELDS + (
+        "MODULATION_SCHEME", "FEC_TYPE", "CODING_RATE", "LDPC_BLOCK_LENGTH", "ORBIT_ALTITUDE",
+        "ORBIT_INCLINATION", "ORBIT_RAAN", "ORBIT_ARG_LATITUDE", "GROUND_LATITUDE",
+        "GROUND_LONGITUDE", "MIN_ELEVATION", "ACM_TARGET_BER", "ACM_HYSTERESIS_DB", "ACM_MARGIN_DB",
+    ),
+    "simulation": SIMULATION_FIELDS,
+    # WORKERS is left out on purpose: a seed gives the same sweep on any worker count
+    "sweep": SIMULATION_FIELDS + ("SWEEP_SNR_DB", "FRAME_BITS", "TARGET_ERRORS", "MAX_BITS"),
+}
+
+
+def _canonical(value):
+    """JSON-serialisable form of a config value, stable across runs and processes"""
+    if isinstance(value, np.ndarray):
+        return [_canonical(v) for v in value.tolist()]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.generic):
+        return _canonical(value.item())
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def canonical_config(config, fields):
+    """Plain-JSON dict of the given Config fields"""
+    return {name: _canonical(getattr(config, name)) for name in fields}
+
+
+def config_fingerprint(config, fields):
+    """Stable SHA-256 hex digest of the given Config fields"""
+    payload = canonical_config(config, fields)
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+def estimate_size(value):
+    """Approximate memory footprint of a cached value in bytes"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by entry count and total estimated bytes
+    
+    Safe to share between threads, as the app does across Streamlit sessions:
+    every lookup and update holds the cache's lock.
+    """
+    def __init__(self, max_entries=64, max_bytes=256 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+    
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries to stay within the caps
+        
+        A value larger than max_bytes on its own is not stored.
+        """
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class ResultCache:
+    """Per-stage results keyed by a hash of only the Config fields that stage reads"""
+    def __init__(self, max_entries=64, max_bytes=256 * 2**20):
+        self.lru = LRUCache(max_entries, max_bytes)
+    
+    def key(self, stage, config, *extra):
+        """Cache key for a stage; extra distinguishes e.g. several plots of one stage"""
+        return (stage, config_fingerprint(config, STAGE_FIELDS[stage])) + tuple(extra)
+    
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss
+        
+        The lookup and the store each hold the LRU lock, but compute() runs
+        outside it, so one slow stage never blocks other sessions; two
+        sessions missing the same key at once may both compute it.
+        """
+        value = self.lru.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.lru.put(key, value)
+        return value
+
+
+_MISSING = object()
\ No newline at end of file
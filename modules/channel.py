@@ -1,26 +1,41 @@
 import numpy as np
 
 class SatelliteChannel:
-    def __init__(self, snr_db, phase_offset=0, frequency_offset=0):
+    def __init__(self, snr_db, phase_offset=0, frequency_offset=0, rng=None, buffered=False, fading=None):
         self.snr_db = snr_db
         self.phase_offset = phase_offset
         self.frequency_offset = frequency_offset
+        # Own Generator so parallel runs draw from independent, reproducible streams
+        self.rng = rng if rng is not None else np.random.default_rng()
+        # complex64 engine working in buffers reused across frames
+        self.buffered = buffered
+        self._buffers = {}
+        self._ramp_length = 0
+        # Time-correlated processes with a gains(n) method (see modules.fading); their
+        # realisations continue across frames, and the last gains are kept for equalization
+        self.fading = list(fading) if fading is not None else []
+        self.last_gains = None
     
-    def add_noise(self, signal):
-        """Add AWGN noise to the signal"""
-        signal_power = np.mean(np.abs(signal)**2)
+    def noise_variance(self, signal_power=1.0):
+        """Complex noise variance (N0) added for a given mean signal power"""
         snr_linear = 10**(self.snr_db / 10)
-        noise_power = signal_power / snr_linear
+        return signal_power / snr_linear
+    
+    def add_noise(self, signal, signal_power=None):
+        """Add AWGN noise to the signal (SNR relative to signal_power, measured if not given)"""
+        if signal_power is None:
+            signal_power = np.mean(np.abs(signal)**2)
+        noise_power = self.noise_variance(signal_power)
         
         # Generate complex Gaussian noise
-        noise = np.sqrt(noise_power/2) * (np.random.randn(len(signal)) + 
-                                        1j * np.random.randn(len(signal)))
+        noise = np.sqrt(noise_power/2) * (self.rng.standard_normal(len(signal)) + 
+                                        1j * self.rng.standard_normal(len(signal)))
         
         return signal + noise
     
     def add_phase_noise(self, signal):
         """Add phase noise to the signal"""
-        phase_noise = np.exp(1j * self.phase_offset * np.random.randn(len(signal)))
+        phase_noise = np.exp(1j * self.phase_offset * self.rng.standard_normal(len(signal)))
         return signal * phase_noise
     
     def add_frequency_offset(self, signal, sample_rate):
@@ -29,8 +44,83 @@ class SatelliteChannel:
         freq_shift = np.exp(1j * 2 * np.pi * self.frequency_offset * t)
         return signal * freq_shift
     
+    def fading_gains(self, n):
+        """Product of the next n gains of every fading process"""
+        gains = np.ones(n, dtype=complex)
+        for process in self.fading:
+            gains = gains * process.gains(n)
+        return gains
+    
+    def equalize(self, received):
+        """Perfect-CSI equalization with the gains of the last frame
+        
+        Returns (equalized symbols, per-symbol noise variance scale 1/|h|^2).
+        """
+        if self.last_gains is None:
+            return received, np.ones(len(received))
+        return received / self.last_gains, 1 / np.abs(self.last_gains)**2
+    
+    def _buffer(self, name, size, dtype):
+        """Preallocated work array of at least `size` elements, grown only when needed"""
+        buffer = self._buffers.get(name)
+        if buffer is None or len(buffer) < size:
+            buffer = np.empty(size, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer[:size]
+    
+    def _unit_phasor(self, phase):
+        """exp(1j * phase) written into the reusable complex64 rotation buffer"""
+        rotation = self._buffer('rotation', len(phase), np.complex64)
+        np.cos(phase, out=rotation.real)
+        np.sin(phase, out=rotation.imag)
+        return rotation
+    
+    def simulate_channel_buffered(self, signal, sample_rate=None):
+        """complex64 channel that generates and applies every impairment in place
+        
+        Noise is drawn by the Generator straight into the output buffer, and the
+        phase and rotation work arrays are reused, so a run of equal-sized
+        frames allocates nothing per frame. The returned array is a view of
+        that buffer and is overwritten by the next call.
+        """
+        n = len(signal)
+        out = self._buffer('output', n, np.complex64)
+        phase = self._buffer('phase', n, np.float32)
+        
+        # Unit noise straight into the interleaved re/im float32 view of the output
+        self.rng.standard_normal(dtype=np.float32, out=out.view(np.float32))
+        
+        x = self._buffer('signal', n, np.complex64)
+        x[...] = signal
+        if self.phase_offset != 0:
+            self.rng.standard_normal(dtype=np.float32, out=phase)
+            phase *= self.phase_offset
+            x *= self._unit_phasor(phase)
+        
+        if sample_rate is not None and self.frequency_offset != 0:
+            ramp = self._buffer('ramp', n, np.float32)
+            if self._ramp_length < n:
+                ramp[...] = np.arange(n, dtype=np.float32)
+                self._ramp_length = n
+            np.multiply(ramp, np.float32(2 * np.pi * self.frequency_offset / sample_rate), out=phase)
+            x *= self._unit_phasor(phase)
+        
+        # Noise is set by the power before fading, so fades lower the SNR
+        signal_power = np.vdot(x, x).real / n if n > 0 else 0.0
+        if self.fading:
+            self.last_gains = self.fading_gains(n)
+            x *= self.last_gains
+        
+        # Scale the noise and add the signal
+        out *= np.float32(np.sqrt(self.noise_variance(signal_power) / 2))
+        out += x
+        return out
+    
     def simulate_channel(self, signal, sample_rate=None):
         """Simulate satellite channel effects"""
+        if self.buffered:
+            return self.simulate_channel_buffered(signal, sample_rate)
+        
         # Add phase noise
         if self.phase_offset != 0:
             signal = self.add_phase_noise(signal)
@@ -39,7 +129,33 @@ class SatelliteChannel:
         if sample_rate is not None and self.frequency_offset != 0:
             signal = self.add_frequency_offset(signal, sample_rate)
         
+        # Apply fading; noise stays referenced to the unfaded power
+        signal_power = None
+        if self.fading:
+            signal_power = np.mean(np.abs(signal)**2)
+            self.last_gains = self.fading_gains(len(signal))
+            signal = signal * self.last_gains
+        
         # Add AWGN noise
-        signal = self.add_noise(signal)
+        signal = self.add_noise(signal, signal_power)
+        
+        return signal
+    
+    def simulate_batch(self, signals):
+        """AWGN and phase noise over a (links x samples) array in one pass
         
-        return signal
\ No newline at end of file
+        snr_db may be a scalar or one value per row; each row's noise is set
+        by that row's mean signal power.
+        """
+        signals = np.atleast_2d(signals)
+        if self.phase_offset != 0:
+            signals = signals * np.exp(1j * self.phase_offset * self.rng.standard_normal(signals.shape))
+        signal_power = np.mean(np.abs(signals)**2, axis=1)
+        noise_power = self.noise_variance(signal_power) * np.ones(len(signals))
+        noise = self.rng.standard_normal(signals.shape) + 1j * self.rng.standard_normal(signals.shape)
+        return signals + np.sqrt(noise_power / 2)[:, None] * noise
+    
+    def stream(self, frames, sample_rate=None):
+        """Pass an iterable of symbol frames through the channel one frame at a time"""
+        for frame in frames:
+            yield self.simulate_channel(frame, sample_rate)
\ No newline at end of file
@@ -1,38 +1,68 @@
+import itertools
+import time
 import numpy as np
 
 class ErrorCorrection:
     def __init__(self, coding_rate=0.75):
         self.coding_rate = coding_rate
     
+    @property
+    def repetition(self):
+        """Number of times each data bit is repeated (1 when uncoded)"""
+        if self.coding_rate >= 0.99:  # No coding
+            return 1
+        return int(1/self.coding_rate)
+    
+    @property
+    def rate(self):
+        """Actual information rate of the code"""
+        return 1 / self.repetition
+    
+    @property
+    def uncoded(self):
+        """True when encode() passes the data bits through unchanged"""
+        return self.repetition == 1
+    
+    def encoded_length(self, num_bits):
+        """Number of transmitted bits for a frame of num_bits data bits"""
+        return num_bits * self.repetition
+    
     def encode(self, data_bits):
         """Simple repetition coding (for demonstration)"""
-        if self.coding_rate >= 0.99:  # No coding
-            return data_bits.copy()
-            
-        repetition = int(1/self.coding_rate)
-        encoded_bits = []
-        for bit in data_bits:
-            encoded_bits.extend([bit] * repetition)
-        return np.array(encoded_bits)
+        if self.repetition == 1:
+            return np.array(data_bits, copy=True)
+        return np.repeat(data_bits, self.repetition)
+    
+    def _combine(self, values):
+        """Sum each group of `repetition` values, plus the partial group at the tail"""
+        values = np.asarray(values)
+        n_full = len(values) // self.repetition
+        sums = values[:n_full * self.repetition].reshape(n_full, self.repetition).sum(axis=1)
+        counts = np.full(n_full, self.repetition)
+        if len(values) > n_full * self.repetition:
+            tail = values[n_full * self.repetition:]
+            sums = np.append(sums, tail.sum())
+            counts = np.append(counts, len(tail))
+        return sums, counts
     
     def decode(self, received_bits):
-        """Majority voting decoding"""
-        if self.coding_rate >= 0.99:  # No coding
-            return received_bits.copy()
-            
-        repetition = int(1/self.coding_rate)
-        decoded_bits = []
+        """Majority voting decoding (soft values are thresholded on their mean)"""
+        if self.repetition == 1:
+            return np.array(received_bits, copy=True)
         
-        for i in range(0, len(received_bits), repetition):
-            segment = received_bits[i:i+repetition]
-            # Use soft decision if values are not binary
-            if np.any((segment != 0) & (segment != 1)):
-                decoded_bit = 1 if np.mean(segment) > 0.5 else 0
-            else:
-                decoded_bit = 1 if np.sum(segment) > len(segment)/2 else 0
-            decoded_bits.append(decoded_bit)
+        sums, counts = self._combine(received_bits)
+        return (2 * sums > counts).astype(int)
+    
+    def decode_soft(self, llrs):
+        """Soft-decision decoding: sum the LLRs of each repeated bit and take the sign
         
-        return np.array(decoded_bits)
+        LLRs follow the log(P(b=0) / P(b=1)) convention of Modulator.demodulate_soft.
+        """
+        if self.repetition == 1:
+            return (np.asarray(llrs) < 0).astype(int)
+        
+        sums, _ = self._combine(llrs)
+        return (sums < 0).astype(int)
     
     def calculate_ber(self, original_bits, received_bits):
         """Calculate Bit Error Rate"""
@@ -42,4 +72,439 @@ class ErrorCorrection:
             received_bits = received_bits[:min_len]
             
         errors = np.sum(original_bits != received_bits)
-        return errors / len(original_bits) if len(original_bits) > 0 else 0
\ No newline at end of file
+        return errors / len(original_bits) if len(original_bits) > 0 else 0
+    
+    def encode_stream(self, frames):
+        """Encode an iterable of data frames, yielding one encoded frame per input frame"""
+        for frame in frames:
+            yield self.encode(frame)
+    
+    def decode_stream(self, frames, soft=False, frame_bits=None):
+        """Decode an iterable of received frames (hard bits, or LLRs when soft=True)
+        
+        frame_bits, an iterable of data-frame sizes, trims the modulator's
+        symbol padding off each received frame before decoding.
+        """
+        decode = self.decode_soft if soft else self.decode
+        sizes = frame_bits if frame_bits is not None else itertools.repeat(None)
+        for frame, size in zip(frames, sizes):
+            if size is not None:
+                frame = frame[:self.encoded_length(size)]
+            yield decode(frame)
+
+
+# Industry-standard K=7 generators, X = 171 and Y = 133 (octal), MSB taps the current input bit
+CONV_CONSTRAINT_LENGTH = 7
+CONV_GENERATORS = (0o171, 0o133)
+
+# DVB-S / IEEE 802.11 puncturing patterns for the 171/133 mother code, rows X and Y
+PUNCTURE_PATTERNS = {
+    1/2: ((1,), (1,)),
+    2/3: ((1, 0), (1, 1)),
+    3/4: ((1, 0, 1), (1, 1, 0)),
+    5/6: ((1, 0, 1, 0, 1), (1, 1, 0, 1, 0)),
+    7/8: ((1, 0, 0, 0, 1, 0, 1), (1, 1, 1, 1, 0, 1, 0)),
+}
+
+# Published free distance of the punctured code at each rate; every
+# ConvolutionalCode checks its own trellis against this on construction
+CONV_FREE_DISTANCE = {1/2: 10, 2/3: 6, 3/4: 5, 5/6: 4, 7/8: 3}
+
+_distance_spectra = {}
+
+
+class ConvolutionalCode(ErrorCorrection):
+    """Rate-1/2 K=7 convolutional code, punctured, with a batched Viterbi decoder
+    
+    The punctured rate is the highest standard rate not above coding_rate
+    (1/2 for anything lower). Frames are terminated with K-1 zero tail bits.
+    encode/decode accept one frame (1-D) or a batch of equal-length frames
+    (2-D, frames x bits), and the Viterbi add-compare-select runs over all
+    states and frames at once.
+    """
+    def __init__(self, coding_rate=0.75):
+        super().__init__(coding_rate)
+        self.punctured_rate = max([r for r in PUNCTURE_PATTERNS if r <= coding_rate + 1e-9], default=1/2)
+        pattern = np.array(PUNCTURE_PATTERNS[self.punctured_rate], dtype=bool)
+        # Mask over the interleaved X0 Y0 X1 Y1 ... stream for one puncturing period
+        self.puncture_mask = pattern.T.reshape(-1)
+        
+        self.memory = CONV_CONSTRAINT_LENGTH - 1
+        self.num_states = 1 << self.memory
+        taps = np.array([[(g >> (self.memory - j)) & 1 for j in range(CONV_CONSTRAINT_LENGTH)]
+                         for g in CONV_GENERATORS], dtype=np.int8)
+        self.taps = taps  # taps[i, j] multiplies u[n - j]
+        
+        # Trellis: state holds the previous K-1 inputs, u[n-1] in the MSB. Each next
+        # state s' has predecessors ((s' & mask) << 1) | b for b in {0, 1}
+        next_states = np.arange(self.num_states)
+        low = (next_states & (self.num_states // 2 - 1)) << 1
+        self.predecessors = np.stack([low, low | 1], axis=1)
+        inputs = next_states >> (self.memory - 1)
+        registers = (inputs[:, None] << self.memory) | self.predecessors
+        outputs = np.stack([self._parity(registers & g) for g in CONV_GENERATORS], axis=-1)
+        # Antipodal branch labels: +1 for coded bit 0, -1 for coded bit 1
+        self.branch_signs = 1 - 2 * outputs.astype(float)  # (states, 2, 2)
+        
+        if self.punctured_rate not in _distance_spectra:
+            _distance_spectra[self.punctured_rate] = self._distance_spectrum(CONV_FREE_DISTANCE[self.punctured_rate] + 1)
+        distance, _ = self.free_distance
+        if distance != CONV_FREE_DISTANCE[self.punctured_rate]:
+            raise ValueError(f"Rate {self.punctured_rate:.3g} puncturing gives free distance {distance}, "
+                             f"expected {CONV_FREE_DISTANCE[self.punctured_rate]}; generators and "
+                             f"puncture patterns disagree")
+    
+    @property
+    def rate(self):
+        return self.punctured_rate
+    
+    @property
+    def uncoded(self):
+        return False
+    
+    @property
+    def free_distance(self):
+        """(free distance, total information weight of the paths at that distance)
+        
+        The weight is summed over the starting phases of the puncturing period,
+        as the union bound B_free Q(sqrt(2 R d_free Eb/N0)) / P expects.
+        """
+        return _distance_spectra[self.punctured_rate]
+    
+    def _distance_spectrum(self, max_distance, max_steps=256):
+        """Search the punctured trellis for paths leaving and rejoining state 0
+        
+        Tracks, per state and output weight up to max_distance, the number of
+        paths and their summed input weight; paths heavier than max_distance
+        are dropped, so the search ends once every path has merged or exceeded it.
+        A puncturing that leaves zero-weight cycles would never end, so the search
+        stops after max_steps trellis steps with the lightest merge found so far.
+        """
+        period = len(self.puncture_mask) // 2
+        kept = self.puncture_mask.reshape(period, 2).astype(int)
+        inputs = np.arange(2)[:, None]
+        states = np.arange(self.num_states)[None, :]
+        registers = (inputs << self.memory) | states  # (input, state)
+        outputs = np.stack([self._parity(registers & g) for g in CONV_GENERATORS], axis=-1)
+        next_states = (inputs << (self.memory - 1)) | (states >> 1)
+        
+        counts = np.zeros(max_distance + 1)
+        weights = np.zeros(max_distance + 1)
+        for phase in range(period):
+            # Leave state 0 with input 1; later steps never pass through state 0
+            first = int(outputs[1, 0] @ kept[phase])
+            paths = np.zeros((self.num_states, max_distance + 1))
+            info = np.zeros_like(paths)
+            paths[next_states[1, 0], first] = info[next_states[1, 0], first] = 1
+            step = phase + 1
+            while paths.any() and step < phase + max_steps:
+                branch = outputs @ kept[step % period]  # (input, state)
+                new_paths, new_info = np.zeros_like(paths), np.zeros_like(info)
+                for b in range(2):
+                    for d in range(max_distance + 1):
+                        target = d + branch[b]
+                        ok = (target <= max_distance) & (paths[:, d] > 0)
+                        np.add.at(new_paths, (next_states[b, ok], target[ok]), paths[ok, d])
+                        np.add.at(new_info, (next_states[b, ok], target[ok]), info[ok, d] + b * paths[ok, d])
+                counts += new_paths[0]
+                weights += new_info[0]
+                new_paths[0] = new_info[0] = 0
+                paths, info = new_paths, new_info
+                step += 1
+        distance = int(np.flatnonzero(counts)[0])
+        return distance, int(weights[distance])
+    
+    @staticmethod
+    def _parity(values):
+        values = np.asarray(values)
+        parity = np.zeros_like(values)
+        while np.any(values):
+            parity ^= values & 1
+            values = values >> 1
+        return parity
+    
+    def _kept(self, num_coded):
+        """Puncturing mask tiled over num_coded mother-code bits"""
+        reps = -(-num_coded // len(self.puncture_mask))
+        return np.tile(self.puncture_mask, reps)[:num_coded]
+    
+    def encode(self, data_bits):
+        """Convolutionally encode, terminate and puncture one frame or a batch of frames"""
+        data_bits = np.asarray(data_bits)
+        batch = np.atleast_2d(data_bits).astype(np.int8)
+        frames, length = batch.shape
+        u = np.concatenate([batch, np.zeros((frames, self.memory), dtype=np.int8)], axis=1)
+        
+        # Shift-and-XOR convolution over the whole batch
+        steps = u.shape[1]
+        coded = np.zeros((frames, steps, 2), dtype=np.int8)
+        for j in range(CONV_CONSTRAINT_LENGTH):
+            shifted = np.zeros_like(u)
+            shifted[:, j:] = u[:, :steps - j]
+            coded ^= shifted[:, :, None] * self.taps[:, j]
+        
+        coded = coded.reshape(frames, -1)[:, self._kept(2 * steps)]
+        return coded[0] if data_bits.ndim == 1 else coded
+    
+    def encoded_length(self, num_bits):
+        """Number of transmitted bits for a frame of num_bits data bits"""
+        return int(self._kept(2 * (num_bits + self.memory)).sum())
+    
+    def _steps_for(self, num_received):
+        """Trellis length whose punctured output is exactly num_received bits"""
+        per_period = int(self.puncture_mask.sum())
+        period_steps = len(self.puncture_mask) // 2
+        step_counts = np.cumsum(self.puncture_mask.reshape(-1, 2).sum(axis=1))
+        periods, remaining = divmod(num_received, per_period)
+        return periods * period_steps + int(np.searchsorted(step_counts, remaining, side='right'))
+    
+    def viterbi(self, llrs):
+        """Max-likelihood decoding of a (frames x received) array of LLRs
+        
+        LLRs follow the log(P(b=0) / P(b=1)) convention; punctured positions are
+        re-inserted as zero-LLR erasures. Returns a (frames x data bits) array.
+        """
+        llrs = np.atleast_2d(np.asarray(llrs, dtype=float))
+        frames = llrs.shape[0]
+        steps = self._steps_for(llrs.shape[1])
+        kept = self._kept(2 * steps)
+        
+        depunctured = np.zeros((frames, 2 * steps), dtype=np.float32)
+        depunctured[:, kept] = llrs[:, :int(kept.sum())]
+        depunctured = depunctured.reshape(frames, steps, 2)
+        
+        # Next states s' and s' + S/2 share the predecessor pair (2j, 2j + 1), so the
+        # predecessor metrics are just the current metrics viewed as (S/2, 2)
+        half = self.num_states // 2
+        signs = self.branch_signs.reshape(2 * self.num_states, 2).T.astype(np.float32)  # (2, states * 2)
+        metrics = np.full((frames, self.num_states), -1e30, dtype=np.float32)
+        metrics[:, 0] = 0.0
+        decisions = np.empty((steps, frames, self.num_states), dtype=bool)
+        for t in range(steps):
+            # Add-compare-select over every (frame, state, predecessor) at once
+            branch = (depunctured[:, t] @ signs).reshape(frames, 2, half, 2)
+            candidates = branch + metrics.reshape(frames, 1, half, 2)
+            np.greater(candidates[..., 1], candidates[..., 0], out=decisions[t].reshape(frames, 2, half))
+            metrics = np.maximum(candidates[..., 0], candidates[..., 1]).reshape(frames, self.num_states)
+            if t % 64 == 63:
+                metrics -= metrics.max(axis=1, keepdims=True)
+        
+        # Trace back from the all-zero termination state
+        state = np.zeros(frames, dtype=np.intp)
+        bits = np.empty((frames, steps), dtype=int)
+        rows = np.arange(frames)
+        for t in range(steps - 1, -1, -1):
+            bits[:, t] = state >> (self.memory - 1)
+            state = self.predecessors[state, decisions[t, rows, state].astype(np.intp)]
+        return bits[:, :steps - self.memory]
+    
+    def decode(self, received_bits):
+        """Hard-input Viterbi decoding of one frame or a batch of frames"""
+        received_bits = np.asarray(received_bits)
+        decoded = self.viterbi(1 - 2 * np.atleast_2d(received_bits).astype(float))
+        return decoded[0] if received_bits.ndim == 1 else decoded
+    
+    def decode_soft(self, llrs):
+        """Soft-input Viterbi decoding of one frame or a batch of frames"""
+        llrs = np.asarray(llrs)
+        decoded = self.viterbi(llrs)
+        return decoded[0] if llrs.ndim == 1 else decoded
+
+
+class LDPCCode(ErrorCorrection):
+    """DVB-S2-style IRA LDPC code with a batched normalized min-sum decoder
+    
+    H = [A | P]: A is a pseudo-random sparse matrix with column weight
+    column_weight and balanced row weights, and P is the dual-diagonal
+    accumulator used by DVB-S2, so encoding is a running XOR. H is kept only
+    in edge-indexed form: per-edge check and variable indices plus a padded
+    (checks x max degree) edge table. Data are split into k-bit blocks, and
+    every block is decoded in the same batch with per-frame early termination
+    on a zero syndrome.
+    """
+    def __init__(self, coding_rate=0.5, block_length=648, column_weight=3,
+                 max_iterations=50, normalization=0.75, seed=0):
+        super().__init__(coding_rate)
+        self.n = block_length
+        self.k = int(np.clip(round(block_length * coding_rate), 1, block_length - 1))
+        self.m = self.n - self.k
+        self.max_iterations = max_iterations
+        self.normalization = normalization
+        self.stats = {}
+        
+        # Info part: each data bit joins column_weight distinct checks, rows balanced
+        rng = np.random.default_rng(seed)
+        weight = min(column_weight, self.m)
+        sockets = rng.permutation(np.resize(np.arange(self.m), self.k * weight)).reshape(self.k, weight)
+        for _ in range(100 * self.k):
+            dup = np.flatnonzero([len(set(row)) < weight for row in sockets])
+            if len(dup) == 0:
+                break
+            i, j = dup[0], rng.integers(self.k)
+            a, b = rng.integers(weight), rng.integers(weight)
+            sockets[i, a], sockets[j, b] = sockets[j, b], sockets[i, a]
+        
+        # Parity part: check j joins parity bits j and j - 1
+        parity_checks = np.concatenate([np.arange(self.m), np.arange(1, self.m)])
+        parity_vars = self.k + np.concatenate([np.arange(self.m), np.arange(self.m - 1)])
+        
+        checks = np.concatenate([sockets.reshape(-1), parity_checks])
+        variables = np.concatenate([np.repeat(np.arange(self.k), weight), parity_vars])
+        order = np.lexsort((variables, checks))
+        self.edge_check = checks[order]
+        self.edge_var = variables[order]
+        self.num_edges = len(self.edge_var)
+        
+        # Padded check table of edge indices; padding points at a dummy edge
+        degrees = np.bincount(self.edge_check, minlength=self.m)
+        starts = np.concatenate([[0], np.cumsum(degrees)[:-1]])
+        slots = np.arange(degrees.max())
+        self.check_table = np.where(slots < degrees[:, None], starts[:, None] + slots, self.num_edges)
+        # Same table in variable indices; padding points at an always-zero bit n
+        self.check_vars = np.append(self.edge_var, self.n)[self.check_table].T
+        
+        # Padded variable table of edge indices for summing messages per variable
+        var_order = np.argsort(self.edge_var, kind='stable')
+        var_degrees = np.bincount(self.edge_var, minlength=self.n)
+        var_starts = np.concatenate([[0], np.cumsum(var_degrees)[:-1]])
+        var_slots = np.arange(var_degrees.max())
+        self.var_table = np.where(var_slots < var_degrees[:, None],
+                                  var_order[np.minimum(var_starts[:, None] + var_slots, self.num_edges - 1)],
+                                  self.num_edges).T
+        
+        # Encoder table: info bits of each check, padded with a dummy zero bit
+        info = self.edge_var < self.k
+        info_degrees = np.bincount(self.edge_check[info], minlength=self.m)
+        info_starts = np.concatenate([[0], np.cumsum(info_degrees)[:-1]])
+        info_slots = np.arange(info_degrees.max())
+        info_vars = self.edge_var[info]
+        self.encoder_table = np.where(info_slots < info_degrees[:, None],
+                                      info_vars[np.minimum(info_starts[:, None] + info_slots, len(info_vars) - 1)],
+                                      self.k)
+    
+    @property
+    def rate(self):
+        return self.k / self.n
+    
+    @property
+    def uncoded(self):
+        return False
+    
+    def encoded_length(self, num_bits):
+        return -(-num_bits // self.k) * self.n
+    
+    def encode(self, data_bits):
+        """Split into k-bit blocks (zero-padding the last) and encode each into n bits"""
+        data_bits = np.asarray(data_bits)
+        blocks = -(-len(data_bits) // self.k)
+        flat = np.zeros(blocks * self.k, dtype=np.int8)
+        flat[:len(data_bits)] = data_bits
+        # Extra always-zero column is the target of the encoder table's padding
+        u = np.zeros((blocks, self.k + 1), dtype=np.int8)
+        u[:, :self.k] = flat.reshape(blocks, self.k)
+        
+        # Accumulator: p_j = p_(j-1) xor (A u)_j
+        syndromes = np.bitwise_xor.reduce(u[:, self.encoder_table], axis=2)
+        parity = np.bitwise_xor.accumulate(syndromes, axis=1)
+        return np.concatenate([u[:, :self.k], parity], axis=1).reshape(-1)
+    
+    def _syndrome_ok(self, hard):
+        """Zero-syndrome flag per column of an (n x frames) array of hard decisions"""
+        padded = np.concatenate([hard, np.zeros((1, hard.shape[1]), dtype=hard.dtype)])
+        parity = np.zeros((self.m, hard.shape[1]), dtype=hard.dtype)
+        for slot in self.check_vars:
+            parity ^= padded[slot]
+        return ~np.any(parity, axis=0)
+    
+    def syndrome_ok(self, hard_bits):
+        """True for each (frames x n) codeword that satisfies every parity check"""
+        return self._syndrome_ok(np.ascontiguousarray(np.asarray(hard_bits).T))
+    
+    def min_sum(self, llrs):
+        """Flooding normalized min-sum over a (frames x n) batch of channel LLRs
+        
+        Returns (hard decisions, iterations used per frame). Frames leave the
+        active set as soon as their syndrome is zero. Internally frames are the
+        last axis, so every edge gather and per-variable sum moves whole rows.
+        """
+        channel = np.ascontiguousarray(np.asarray(llrs, dtype=np.float32).T)  # (n, frames)
+        frames = channel.shape[1]
+        hard = (channel < 0).astype(np.int8)
+        iterations = np.zeros(frames, dtype=int)
+        active = np.flatnonzero(~self._syndrome_ok(hard))
+        
+        channel_active = channel[:, active]
+        posterior = channel_active
+        # Check-to-variable messages per edge, plus an all-zero dummy edge row
+        messages = np.zeros((self.num_edges + 1, len(active)), dtype=np.float32)
+        for iteration in range(1, self.max_iterations + 1):
+            if len(active) == 0:
+                break
+            
+            # Variable-to-check messages; the dummy edge never wins the min and has sign +
+            to_check = np.empty_like(messages)
+            np.subtract(posterior[self.edge_var], messages[:-1], out=to_check[:-1])
+            to_check[-1] = np.inf
+            
+            # Running min1/min2 and sign parity across the check table slots
+            slots = [to_check[edges] for edges in self.check_table.T]  # each (checks, frames)
+            min1 = np.full_like(slots[0], np.inf)
+            min2 = np.full_like(slots[0], np.inf)
+            negative = np.zeros(slots[0].shape, dtype=bool)
+            for values in slots:
+                magnitude = np.abs(values)
+                np.minimum(min2, np.maximum(min1, magnitude), out=min2)
+                np.minimum(min1, magnitude, out=min1)
+                negative ^= values < 0
+            
+            sign = np.where(negative, -self.normalization, self.normalization).astype(np.float32)
+            for edges, values in zip(self.check_table.T, slots):
+                magnitude = np.abs(values)
+                extrinsic = np.where(magnitude == min1, min2, min1) * sign
+                messages[edges] = np.where(values < 0, -extrinsic, extrinsic)
+            messages[-1] = 0
+            
+            posterior = channel_active.copy()
+            for edges in self.var_table:
+                posterior += messages[edges]
+            decisions = (posterior < 0).astype(np.int8)
+            hard[:, active] = decisions
+            iterations[active] = iteration
+            
+            keep = ~self._syndrome_ok(decisions)
+            if not keep.all():
+                active, channel_active = active[keep], channel_active[:, keep]
+                posterior, messages = posterior[:, keep], messages[:, keep]
+        
+        return hard.T, iterations
+    
+    def decode_soft(self, llrs):
+        """Decode whole n-bit codewords of LLRs as one batch; returns the k data bits of each"""
+        llrs = np.asarray(llrs)
+        blocks = len(llrs) // self.n
+        start = time.perf_counter()
+        hard, iterations = self.min_sum(llrs[:blocks * self.n].reshape(blocks, self.n))
+        elapsed = time.perf_counter() - start
+        
+        self.stats = {
+            'frames': blocks,
+            'average_iterations': float(iterations.mean()) if blocks else 0.0,
+            'throughput': blocks * self.k / elapsed if elapsed > 0 else float('inf'),  # data bits/s
+        }
+        return hard[:, :self.k].reshape(-1).astype(int)
+    
+    def decode(self, received_bits):
+        """Hard-input decoding: bits become unit-magnitude LLRs"""
+        return self.decode_soft(1 - 2 * np.asarray(received_bits, dtype=float))
+
+
+def create_fec(config):
+    """Build the FEC selected by config.FEC_TYPE"""
+    if config.FEC_TYPE == "Repetition":
+        return ErrorCorrection(coding_rate=config.CODING_RATE)
+    if config.FEC_TYPE == "Convolutional":
+        return ConvolutionalCode(coding_rate=config.CODING_RATE)
+    if config.FEC_TYPE == "LDPC":
+        return LDPCCode(coding_rate=config.CODING_RATE, block_length=config.LDPC_BLOCK_LENGTH,
+                        max_iterations=config.LDPC_MAX_ITERATIONS)
+    return ErrorCorrection(coding_rate=1.0)
\ No newline at end of file
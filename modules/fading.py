@@ -0,0 +1,131 @@
+import numpy as np
+
+# Largest a^-k kept in the closed-form AR(1) recursion before starting a new sub-block
+_AR1_MAX_GROWTH = 1e100
+
+
+def ar1_block(white, a, previous):
+    """Run x[k] = a x[k-1] + sqrt(1 - a^2) w[k] over a block without a Python loop per sample
+    
+    Uses x[k] = a^k (a x[-1] + s sum_j a^-j w[j]) evaluated with cumsum, split into
+    sub-blocks short enough that a^-k stays finite.
+    """
+    white = np.asarray(white)
+    out = np.empty_like(white)
+    scale = np.sqrt(1 - a**2)
+    span = len(white) if a >= 1 or a <= 0 else max(1, int(np.log(_AR1_MAX_GROWTH) / -np.log(a)))
+    for start in range(0, len(white), span):
+        w = white[start:start + span]
+        powers = a ** np.arange(len(w))
+        out[start:start + span] = powers * (a * previous + scale * np.cumsum(w / powers))
+        previous = out[start + len(w) - 1]
+    return out
+
+
+class GaussMarkovProcess:
+    """Unit-variance Gaussian process with exponential autocorrelation exp(-|t| / correlation_time)
+    
+    Knots are drawn at points_per_correlation per correlation time with the
+    blockwise AR(1) recursion and linearly interpolated to sample_rate.
+    Successive generate() calls continue the same realisation, so a channel
+    hours long can be produced frame by frame at symbol-rate granularity.
+    """
+    def __init__(self, correlation_time, sample_rate, rng=None, complex_valued=False, points_per_correlation=20):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.complex_valued = complex_valued
+        knot_interval = max(correlation_time / points_per_correlation, 1 / sample_rate)
+        self.a = np.exp(-knot_interval / correlation_time)
+        self.step = 1 / (sample_rate * knot_interval)  # output samples advance this many knots
+        self._knots = self._white(1)
+        self._phase = 0.0
+    
+    def _white(self, n):
+        if self.complex_valued:
+            return (self.rng.standard_normal(n) + 1j * self.rng.standard_normal(n)) / np.sqrt(2)
+        return self.rng.standard_normal(n)
+    
+    def generate(self, n):
+        """Next n samples of the process"""
+        positions = self._phase + np.arange(n) * self.step
+        end = self._phase + n * self.step
+        needed = int(np.floor(end)) + 2
+        if needed > len(self._knots):
+            new = ar1_block(self._white(needed - len(self._knots)), self.a, self._knots[-1])
+            self._knots = np.concatenate([self._knots, new])
+        
+        grid = np.arange(len(self._knots))
+        if self.complex_valued:
+            values = np.interp(positions, grid, self._knots.real) + 1j * np.interp(positions, grid, self._knots.imag)
+        else:
+            values = np.interp(positions, grid, self._knots)
+        
+        drop = int(np.floor(end))
+        self._knots = self._knots[drop:]
+        self._phase = end - drop
+        return values
+
+
+class LooFading:
+    """Loo land-mobile satellite fading: lognormal-shadowed LOS plus Rayleigh multipath
+    
+    The LOS amplitude is 10^((los_mean_db + los_std_db * X(t)) / 20) with X a
+    slow Gauss-Markov process, and the diffuse part is a complex Gauss-Markov
+    process with power multipath_db. los_std_db = 0 gives Rician fading.
+    """
+    def __init__(self, sample_rate, los_mean_db=0.0, los_std_db=0.0, multipath_db=-10.0,
+                 shadow_correlation_time=1.0, multipath_correlation_time=0.01, rng=None):
+        self.los_mean_db = los_mean_db
+        self.los_std_db = los_std_db
+        self.multipath_amplitude = 10**(multipath_db / 20)
+        rng = rng if rng is not None else np.random.default_rng()
+        self.shadowing = GaussMarkovProcess(shadow_correlation_time, sample_rate, rng)
+        self.multipath = GaussMarkovProcess(multipath_correlation_time, sample_rate, rng, complex_valued=True)
+    
+    @classmethod
+    def rician(cls, sample_rate, k_factor_db=10.0, correlation_time=0.01, rng=None):
+        """Unit-power Rician fading with the given K factor"""
+        k = 10**(k_factor_db / 10)
+        return cls(sample_rate, los_mean_db=10 * np.log10(k / (k + 1)), los_std_db=0.0,
+                   multipath_db=10 * np.log10(1 / (k + 1)), multipath_correlation_time=correlation_time, rng=rng)
+    
+    def gains(self, n):
+        """Next n complex channel gains"""
+        shadow = self.shadowing.generate(n) if self.los_std_db != 0 else 0.0
+        los = 10**((self.los_mean_db + self.los_std_db * shadow) / 20)
+        return los + self.multipath_amplitude * self.multipath.generate(n)
+
+
+class RainFade:
+    """Maseng-Bakken lognormal rain attenuation time series
+    
+    Attenuation in dB is median_db * exp(sigma_ln * X(t)), X a unit Gauss-Markov
+    process with the given correlation time (1/beta, minutes in practice).
+    attenuation_db() can also replace the fixed RAIN_MARGIN in
+    LinkBudgetCalculator.calculate_batch for time-series budgets.
+    """
+    def __init__(self, sample_rate, median_db=1.0, sigma_ln=1.0, correlation_time=3000.0, rng=None):
+        self.median_db = median_db
+        self.sigma_ln = sigma_ln
+        self.process = GaussMarkovProcess(correlation_time, sample_rate, rng)
+    
+    def attenuation_db(self, n):
+        """Next n attenuation values in dB"""
+        return self.median_db * np.exp(self.sigma_ln * self.process.generate(n))
+    
+    def gains(self, n):
+        """Next n real amplitude gains"""
+        return 10**(-self.attenuation_db(n) / 20)
+
+
+def create_fading(config, sample_rate, rng=None):
+    """Fading processes selected by the config, as a list for SatelliteChannel(fading=...)"""
+    processes = []
+    if config.FADING_MODEL == "Rician":
+        processes.append(LooFading.rician(sample_rate, config.RICIAN_K_DB, config.FADING_CORRELATION_TIME, rng))
+    elif config.FADING_MODEL == "Loo":
+        processes.append(LooFading(sample_rate, config.LOO_LOS_MEAN_DB, config.LOO_LOS_STD_DB, config.LOO_MULTIPATH_DB,
+                                   config.SHADOW_CORRELATION_TIME, config.FADING_CORRELATION_TIME, rng))
+    if config.RAIN_FADE:
+        processes.append(RainFade(sample_rate, config.RAIN_MEDIAN_DB, config.RAIN_SIGMA_LN,
+                                  config.RAIN_CORRELATION_TIME, rng))
+    return processes
\ No newline at end of file
@@ -0,0 +1,203 @@
+import math
+from statistics import NormalDist
+import numpy as np
+from modules.modulation import Modulator
+from modules.channel import SatelliteChannel
+from modules.error_correction import create_fec
+from modules.simulation import theoretical_ber
+
+# Biases tried by ImportanceSampler.tune when none is given
+TUNE_CANDIDATES = {
+    "mean": (0.25, 0.5, 0.75, 1.0),
+    "variance": (1.25, 1.5, 2.0, 3.0, 4.0),
+}
+
+
+def _logsumexp(values, axis):
+    top = np.max(values, axis=axis, keepdims=True)
+    return np.squeeze(top, axis=axis) + np.log(np.sum(np.exp(values - top), axis=axis))
+
+
+class ImportanceSampler:
+    """Importance-sampling BER estimator for the Modulator / ErrorCorrection chain
+    
+    AWGN is drawn from a biased density q instead of the true density p, so
+    that errors become common, and each error count is weighted by the
+    likelihood ratio p/q of the noise that caused it. Two biases are
+    supported:
+    
+    - "mean": every noise sample is shifted by bias * (neighbour - symbol) / 2
+      toward a nearest constellation neighbour picked at random; bias = 1
+      centres the noise on the decision boundary. q is the mixture over the
+      nearest neighbours, which keeps the weights bounded.
+    - "variance": the noise variance is scaled by bias (> 1).
+    
+    Without coding a bit error depends only on its own symbol, so weights
+    are kept per symbol and the estimate works at any BER. With a code, a
+    decoded error depends on many symbols, and biasing a whole frame makes
+    the weights degenerate. Instead only a `window`-symbol span at a random
+    position is biased, long enough to hold a convolutional error event;
+    the weight uses the mixture over all span positions, so error events
+    anywhere in the frame are covered. The noise is referenced to unit
+    symbol energy, matching the normalized constellations, rather than
+    measured per frame.
+    """
+    def __init__(self, config, method="mean", bias=None, window=32):
+        if method not in TUNE_CANDIDATES:
+            raise ValueError(f"Unknown biasing method {method!r}; expected one of {tuple(TUNE_CANDIDATES)}")
+        self.config = config
+        self.method = method
+        self.bias = bias
+        self.window = window
+        self.modulator = Modulator(config.MODULATION_SCHEME)
+        self.fec = create_fec(config)
+        self.uncoded = self.fec.uncoded
+        
+        # Nearest neighbours of every constellation point, padded to a common count
+        points = self.modulator.constellation
+        distances = np.abs(points[:, None] - points[None, :])
+        np.fill_diagonal(distances, np.inf)
+        nearest = np.isclose(distances, distances.min(axis=1, keepdims=True))
+        self.neighbor_count = nearest.sum(axis=1)
+        order = np.argsort(~nearest, axis=1, kind="stable")[:, :self.neighbor_count.max()]
+        # Padding slots repeat the first neighbour and are masked out of the mixture
+        valid = np.arange(order.shape[1])[None, :] < self.neighbor_count[:, None]
+        self.neighbors = np.where(valid, order, order[:, :1])
+        self.neighbor_valid = valid
+    
+    def _shifts(self, indices, bias):
+        """Every nearest-neighbour mean shift of each symbol, (symbols x max neighbours)"""
+        points = self.modulator.constellation
+        return bias * (points[self.neighbors[indices]] - points[indices][:, None]) / 2
+    
+    def _draw(self, indices, n0, bias, biased, rng):
+        """AWGN for the given symbols, drawn from the biased density where `biased`"""
+        n = len(indices)
+        noise = np.sqrt(n0 / 2) * (rng.standard_normal(n) + 1j * rng.standard_normal(n))
+        if self.method == "variance":
+            noise[biased] *= np.sqrt(bias)
+        else:
+            pick = (rng.random(n) * self.neighbor_count[indices]).astype(np.intp)
+            noise[biased] += self._shifts(indices, bias)[np.arange(n), pick][biased]
+        return noise
+    
+    def _log_likelihood_ratio(self, indices, noise, n0, bias):
+        """log(q / p) of each symbol's noise under the biased density q"""
+        if self.method == "variance":
+            return np.abs(noise)**2 / n0 * (1 - 1 / bias) - np.log(bias)
+        valid = self.neighbor_valid[indices]
+        log_mixture = np.where(valid, -np.abs(noise[:, None] - self._shifts(indices, bias))**2 / n0, -np.inf)
+        log_q = _logsumexp(log_mixture, axis=1) - np.log(self.neighbor_count[indices])
+        return log_q + np.abs(noise)**2 / n0
+    
+    def _frame_log_weight(self, ratios, window):
+        """log(p / q) of a frame biased over one `window`-symbol span at a random position
+        
+        q is the uniform mixture over every span position, so q / p is the mean
+        of exp(span sum of the per-symbol log ratios) over the positions.
+        """
+        positions = len(ratios) - window + 1
+        cumulative = np.concatenate([[0.0], np.cumsum(ratios)])
+        spans = cumulative[window:] - cumulative[:positions]
+        return np.log(positions) - _logsumexp(spans, axis=0)
+    
+    def run_frame(self, snr_db, frame_bits, bias, rng, window=None):
+        """One biased frame: (error count, log weight) per independent unit
+        
+        Units are symbols without coding and the whole frame with it. A coded
+        frame is biased only over a `window`-symbol span at a random position
+        (the whole frame when window is None).
+        """
+        n0 = SatelliteChannel(snr_db).noise_variance()
+        data_bits = rng.integers(0, 2, frame_bits)
+        encoded_bits = self.fec.encode(data_bits)
+        indices = self.modulator.bits_to_indices(encoded_bits)
+        n = len(indices)
+        window = n if self.uncoded or window is None else min(window, n)
+        start = rng.integers(0, n - window + 1)
+        biased = np.zeros(n, dtype=bool)
+        biased[start:start + window] = True
+        noise = self._draw(indices, n0, bias, biased, rng)
+        ratios = self._log_likelihood_ratio(indices, noise, n0, bias)
+        received = self.modulator.constellation[indices] + noise
+        
+        if self.uncoded:
+            decided = self.modulator.slice_symbols(received)
+            errors = (self.modulator.bit_labels[decided] != self.modulator.bit_labels[indices])
+            # Padding bits of the last symbol were never sent
+            errors = errors.reshape(-1)
+            errors[len(encoded_bits):] = False
+            return errors.reshape(n, -1).sum(axis=1), -ratios
+        
+        if self.config.SOFT_DECISION:
+            llrs = self.modulator.demodulate_soft(received, n0)
+            decoded_bits = self.fec.decode_soft(llrs[:len(encoded_bits)])
+        else:
+            received_bits = self.modulator.demodulate(received)
+            decoded_bits = self.fec.decode(received_bits[:len(encoded_bits)])
+        errors = np.count_nonzero(decoded_bits[:frame_bits] != data_bits)
+        return np.array([errors]), np.array([self._frame_log_weight(ratios, window)])
+    
+    def estimate(self, snr_db, num_frames=1000, frame_bits=None, bias=None, rng=None, confidence=0.95):
+        """Importance-sampled BER at one SNR (Es/N0, dB) with a confidence interval
+        
+        Returns a dict with the estimate, its standard error, the normal
+        confidence interval (clipped at 0), the relative error, the
+        effective sample size of the weights and the bias used.
+        """
+        rng = rng if rng is not None else np.random.default_rng(self.config.SEED)
+        frame_bits = frame_bits if frame_bits is not None else (self.config.FRAME_BITS if self.uncoded else 64)
+        bias = bias if bias is not None else self.bias
+        if bias is None:
+            bias = self.tune(snr_db, frame_bits=frame_bits, rng=rng)
+        
+        errors, log_weights = [], []
+        for _ in range(num_frames):
+            frame_errors, frame_log_weights = self.run_frame(snr_db, frame_bits, bias, rng, self.window)
+            errors.append(frame_errors)
+            log_weights.append(frame_log_weights)
+        errors = np.concatenate(errors)
+        weights = np.exp(np.concatenate(log_weights))
+        
+        # Bits behind each unit: one symbol's bits, or a whole frame's data
+        bits_per_unit = self.modulator.bits_per_symbol if self.uncoded else frame_bits
+        samples = weights * errors / bits_per_unit
+        units = len(samples)
+        ber = samples.mean()
+        std_error = samples.std(ddof=1) / math.sqrt(units) if units > 1 else math.inf
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return {
+            'snr_db': snr_db,
+            'ber': ber,
+            'std_error': std_error,
+            'ci_low': max(ber - z * std_error, 0.0),
+            'ci_high': ber + z * std_error,
+            'relative_error': std_error / ber if ber > 0 else math.inf,
+            'effective_samples': weights.sum()**2 / np.sum(weights**2) if np.any(weights) else 0.0,
+            'error_events': int(np.count_nonzero(errors)),
+            'units': units,
+            'bias': bias,
+        }
+    
+    def tune(self, snr_db, frame_bits, candidates=None, pilot_frames=50, rng=None):
+        """Bias with the smallest relative error over short pilot runs"""
+        rng = rng if rng is not None else np.random.default_rng(self.config.SEED)
+        candidates = candidates if candidates is not None else TUNE_CANDIDATES[self.method]
+        best, best_error = candidates[-1], math.inf
+        for bias in candidates:
+            pilot = self.estimate(snr_db, pilot_frames, frame_bits, bias=bias, rng=rng)
+            if pilot['error_events'] > 1 and pilot['relative_error'] < best_error:
+                best, best_error = bias, pilot['relative_error']
+        return best
+    
+    def sweep(self, snr_values, num_frames=1000, frame_bits=None):
+        """Importance-sampled BER curve; returns a dict of arrays like BERSimulator.sweep"""
+        snr_values = np.atleast_1d(np.asarray(snr_values, dtype=float))
+        points = [self.estimate(snr_db, num_frames, frame_bits) for snr_db in snr_values]
+        results = {name: np.array([point[name] for point in points]) for name in points[0]}
+        results['theoretical_ber'] = theoretical_ber(self.config.MODULATION_SCHEME, snr_values)
+        return results
+
+
+def create_importance_sampler(config):
+    return ImportanceSampler(config, method=config.IS_METHOD, window=config.IS_WINDOW)
\ No newline at end of file
@@ -0,0 +1,273 @@
+import asyncio
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+import numpy as np
+from modules.cache import STAGE_FIELDS, config_fingerprint
+from modules.profiling import Profiler
+from modules.simulation import BERSimulator, SweepProgress, run_chain
+from modules.store import ResultStore
+
+JOB_KINDS = ("simulation", "sweep")
+FINISHED = ("done", "failed", "cancelled")
+
+
+def _simulation_job(config, store_root, profile, memory):
+    """Pool entry point: the single-point chain, plus the profiler records it left"""
+    profiler = Profiler(enabled=profile, memory=memory)
+    store = ResultStore(store_root) if store_root is not None else None
+    result = run_chain(config, store, profiler)
+    # Memory-mapped arrays from the store are read into memory before pickling
+    return {name: np.array(value) if isinstance(value, np.ndarray) else value
+            for name, value in result.items()}, profiler.records
+
+
+def _sweep_point_job(config, entropy, point, snr_db):
+    """Pool entry point: (errors, bits) of one sweep point, as BERSimulator.sweep runs it"""
+    return BERSimulator(config).simulate_point(snr_db, point=point, entropy=entropy)
+
+
+class Job:
+    """State of one submitted job, updated only on the service's event loop"""
+    def __init__(self, job_id, kind, config, options):
+        self.id = job_id
+        self.kind = kind
+        self.config = config
+        self.options = options
+        self.state = "queued"
+        self.progress = 0.0
+        self.partial = None  # latest partial result (sweep: counts of the points done so far)
+        self.result = None
+        self.records = []  # profiler records from the worker
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.version = 0  # bumped on every update, for streaming clients
+        self.collected = False  # set by JobService.collect; only collected jobs are forgotten
+    
+    def snapshot(self):
+        """Plain dict of the job's current state, safe to hand to another thread"""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "state": self.state,
+            "progress": self.progress,
+            "partial": self.partial,
+            "result": self.result,
+            "error": self.error,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+            "version": self.version,
+        }
+
+
+class JobService:
+    """Local simulation job queue on an asyncio loop with a bounded worker pool
+    
+    The loop runs in a daemon thread, so synchronous callers such as the
+    Streamlit script can submit() from any thread and poll snapshot() or
+    wait(), while coroutines on any loop can follow a job with stream().
+    At most `workers` pool tasks run at once; sweep points of one job are
+    spread over the pool and reported as they finish. Submitting a job
+    identical to one already known (same kind, options and hash of the
+    Config fields it reads) returns the existing job, so a rerun of the
+    app re-attaches to its job instead of starting another one. Beyond
+    `history` jobs, the oldest finished jobs are forgotten, but only once
+    collect() has handed them out, so an id a caller still holds stays valid.
+    """
+    def __init__(self, workers=2, executor="process", history=100):
+        self.workers = workers
+        self.history = history
+        if executor == "process":
+            # Forking a process that runs threads (Streamlit, this loop) can deadlock
+            self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.jobs = {}
+        self._keys = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="job-service", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+    
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self._queue = asyncio.Queue()
+        self._changed = asyncio.Condition()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._workers = [self.loop.create_task(self._worker()) for _ in range(self.workers)]
+        self._ready.set()
+        self.loop.run_forever()
+    
+    def submit(self, kind, config, **options):
+        """Queue a job and return its id
+        
+        kind is "simulation" (run_chain) or "sweep" (BER over SWEEP_SNR_DB).
+        Options: store (ResultStore directory), profile and memory (profiler
+        switches for simulation jobs).
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind {kind!r}; expected one of {JOB_KINDS}")
+        key = (kind, config_fingerprint(config, STAGE_FIELDS[kind]), tuple(sorted(options.items())))
+        with self._lock:
+            existing = self._keys.get(key)
+            if existing is not None and self.jobs[existing].state not in ("failed", "cancelled"):
+                # A new holder of the id: keep the job until it is collected again
+                self.jobs[existing].collected = False
+                return existing
+            job = Job(next(self._ids), kind, config, options)
+            self.jobs[job.id] = job
+            self._keys[key] = job.id
+            self._forget_old_jobs()
+        self.loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return job.id
+    
+    def _forget_old_jobs(self):
+        """Drop the oldest finished, collected jobs beyond `history`, with their results"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.state in FINISHED and job.collected]
+        for job_id in finished[:max(len(finished) - self.history, 0)]:
+            del self.jobs[job_id]
+        self._keys = {key: job_id for key, job_id in self._keys.items() if job_id in self.jobs}
+    
+    def snapshot(self, job_id):
+        return self.jobs[job_id].snapshot()
+    
+    def collect(self, job_id):
+        """The finished Job, with its result and records
+        
+        Marks the job as handed out, after which it may be forgotten once
+        it falls out of `history`; do not use the id again afterwards.
+        """
+        with self._lock:
+            job = self.jobs[job_id]
+            if job.state not in FINISHED:
+                raise ValueError(f"Job {job_id} is still {job.state}")
+            job.collected = True
+        return job
+    
+    def cancel(self, job_id):
+        """Cancel a job that has not started yet; returns whether it was cancelled"""
+        job = self.jobs[job_id]
+        # The worker claims a job under the same lock, so it cannot start in between
+        with self._lock:
+            if job.state != "queued":
+                return False
+            job.state = "cancelled"
+        asyncio.run_coroutine_threadsafe(self._update(job, finished=time.time()), self.loop).result()
+        return True
+    
+    def wait(self, job_id, timeout=None):
+        """Block until the job finishes (or timeout), then return its snapshot"""
+        future = asyncio.run_coroutine_threadsafe(self._wait_finished(self.jobs[job_id]), self.loop)
+        try:
+            future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+        return self.snapshot(job_id)
+    
+    async def stream(self, job_id):
+        """Async iterator of snapshots, one per update until the job finishes
+        
+        Usable from any event loop; each step waits on the service loop.
+        """
+        job, version = self.jobs[job_id], -1
+        while True:
+            snapshot = await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(self._next_update(job, version), self.loop))
+            version = snapshot["version"]
+            yield snapshot
+            if snapshot["state"] in FINISHED:
+                return
+    
+    def shutdown(self):
+        """Stop the workers and the loop; running pool tasks are abandoned"""
+        asyncio.run_coroutine_threadsafe(self._stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+    
+    async def _stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+    
+    async def _update(self, job, **changes):
+        for name, value in changes.items():
+            setattr(job, name, value)
+        job.version += 1
+        async with self._changed:
+            self._changed.notify_all()
+    
+    async def _next_update(self, job, version):
+        async with self._changed:
+            await self._changed.wait_for(lambda: job.version > version)
+        return job.snapshot()
+    
+    async def _wait_finished(self, job):
+        async with self._changed:
+            await self._changed.wait_for(lambda: job.state in FINISHED)
+    
+    async def _in_pool(self, function, *args):
+        """Run on the pool, holding one of the `workers` slots shared by all jobs"""
+        async with self._slots:
+            return await self.loop.run_in_executor(self.pool, function, *args)
+    
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            with self._lock:
+                if job.state == "cancelled":
+                    continue
+                job.state = "running"
+            await self._update(job, started=time.time())
+            try:
+                if job.kind == "simulation":
+                    await self._run_simulation(job)
+                else:
+                    await self._run_sweep(job)
+                await self._update(job, state="done", progress=1.0, finished=time.time())
+            except Exception as e:
+                await self._update(job, state="failed", error=f"{type(e).__name__}: {e}", finished=time.time())
+    
+    async def _run_simulation(self, job):
+        result, records = await self._in_pool(
+            _simulation_job, job.config, job.options.get("store"),
+            job.options.get("profile", False), job.options.get("memory", False))
+        await self._update(job, result=result, records=records)
+    
+    async def _run_sweep(self, job):
+        config = job.config
+        store = job.options.get("store")
+        # Same resume logic, entropy and per-point streams as BERSimulator.sweep,
+        # so the result matches a direct sweep whatever order the points finish in
+        progress = SweepProgress(BERSimulator(config), config.SWEEP_SNR_DB,
+                                 ResultStore(store) if store is not None else None)
+        if progress.complete:
+            result = progress.stored_result()
+            await self._update(job, result={name: np.array(value) for name, value in result.items()})
+            return
+        
+        async def point(i):
+            return i, await self._in_pool(_sweep_point_job, config, progress.entropy, i, progress.snr_values[i])
+        
+        pending = progress.pending()
+        finished = len(progress.snr_values) - len(pending)
+        for next_point in asyncio.as_completed([point(i) for i in pending]):
+            i, (errors, bits) = await next_point
+            progress.record(i, errors, bits)
+            finished += 1
+            await self._update(job, progress=finished / len(progress.snr_values), partial=progress.partial())
+        
+        await self._update(job, result=progress.result())
+
+
+def create_job_service(config):
+    return JobService(workers=config.JOB_WORKERS, executor=config.JOB_EXECUTOR, history=config.JOB_HISTORY)
\ No newline at end of file
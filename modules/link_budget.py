@@ -1,4 +1,17 @@
 import numpy as np
+from modules.modulation import bits_per_symbol
+
+# Numeric Config fields that calculate_batch accepts as arrays
+LINK_BUDGET_FIELDS = (
+    "SATELLITE_POWER", "SATELLITE_ANTENNA_GAIN", "FREQUENCY",
+    "GROUND_ANTENNA_GAIN", "GROUND_NOISE_TEMP", "GROUND_SYSTEM_LOSSES",
+    "DISTANCE", "ATMOSPHERIC_LOSS", "RAIN_MARGIN", "SYMBOL_RATE",
+)
+
+LINK_BUDGET_DTYPE = np.dtype([
+    ("eirp", float), ("free_space_loss", float), ("received_power", float),
+    ("cn0", float), ("ebn0", float), ("link_margin", float),
+])
 
 class LinkBudgetCalculator:
     def __init__(self, config):
@@ -37,19 +50,49 @@ class LinkBudgetCalculator:
         """Calculate Eb/N0"""
         cn0 = 10**(self.calculate_cn0() / 10)
         
-        # Calculate bits per symbol based on modulation
-        if self.config.MODULATION_SCHEME == "BPSK":
-            bits_per_symbol = 1
-        elif self.config.MODULATION_SCHEME == "QPSK":
-            bits_per_symbol = 2
-        else:
-            bits_per_symbol = 2  # Default to QPSK
-        
-        bit_rate = self.config.SYMBOL_RATE * bits_per_symbol
+        # Bits per symbol come from the modulator's constellation table
+        bit_rate = self.config.SYMBOL_RATE * bits_per_symbol(self.config.MODULATION_SCHEME)
         ebn0 = cn0 / bit_rate
         return 10 * np.log10(ebn0)
     
     def calculate_link_margin(self, required_ebn0):
         """Calculate link margin"""
         actual_ebn0 = self.calculate_ebn0()
-        return actual_ebn0 - required_ebn0
\ No newline at end of file
+        return actual_ebn0 - required_ebn0
+    
+    def calculate_batch(self, required_ebn0=None, **overrides):
+        """Evaluate the full link budget over broadcast parameter arrays
+        
+        Any field in LINK_BUDGET_FIELDS, and MODULATION_SCHEME, can be passed as
+        an array (e.g. FREQUENCY=f[:, None], DISTANCE=d[None, :] for a grid);
+        the rest come from the config. Each intermediate is computed once.
+        Returns a structured array of LINK_BUDGET_DTYPE with the broadcast shape;
+        link_margin is NaN unless required_ebn0 is given.
+        """
+        unknown = set(overrides) - set(LINK_BUDGET_FIELDS) - {"MODULATION_SCHEME"}
+        if unknown:
+            raise ValueError(f"Unknown link budget parameters: {sorted(unknown)}")
+        
+        params = {name: np.asarray(overrides.get(name, getattr(self.config, name)), dtype=float)
+                  for name in LINK_BUDGET_FIELDS}
+        schemes = np.asarray(overrides.get("MODULATION_SCHEME", self.config.MODULATION_SCHEME))
+        params["BITS_PER_SYMBOL"] = np.vectorize(bits_per_symbol, otypes=[float])(schemes)
+        required = np.asarray(np.nan if required_ebn0 is None else required_ebn0, dtype=float)
+        
+        names = list(params)
+        arrays = np.broadcast_arrays(*params.values(), required)
+        p = dict(zip(names, arrays[:-1]))
+        
+        c = 3e8  # speed of light
+        k = 1.38e-23  # Boltzmann's constant
+        result = np.empty(arrays[0].shape, dtype=LINK_BUDGET_DTYPE)
+        result["eirp"] = p["SATELLITE_POWER"] + p["SATELLITE_ANTENNA_GAIN"]
+        result["free_space_loss"] = 20 * np.log10(4 * np.pi * p["DISTANCE"] * p["FREQUENCY"] / c)
+        losses = p["ATMOSPHERIC_LOSS"] + p["RAIN_MARGIN"] + p["GROUND_SYSTEM_LOSSES"]
+        result["received_power"] = result["eirp"] - result["free_space_loss"] - losses + p["GROUND_ANTENNA_GAIN"]
+        
+        # Same dBW -> W convention as calculate_cn0, done in the log domain
+        result["cn0"] = result["received_power"] - 30 - 10 * np.log10(k * p["GROUND_NOISE_TEMP"])
+        result["ebn0"] = result["cn0"] - 10 * np.log10(p["SYMBOL_RATE"] * p["BITS_PER_SYMBOL"])
+        result["link_margin"] = result["ebn0"] - arrays[-1]
+        return result
\ No newline at end of file
@@ -1,80 +1,151 @@
 import numpy as np
 
+# DVB-S2 ring radius ratios for the 3/4 code rate (EN 302 307, Tables 9 and 10)
+APSK16_GAMMA = 2.85
+APSK32_GAMMA = (2.84, 5.27)
+
+# Number of symbols demapped per block, bounds the (symbols x points) distance matrix
+DEMAP_BLOCK_SIZE = 1 << 16
+
+
+def _ring(radius, angles):
+    return radius * np.exp(1j * np.asarray(angles, dtype=float))
+
+
+def _normalize(points):
+    """Scale constellation points to unit average symbol energy"""
+    return points / np.sqrt(np.mean(np.abs(points)**2))
+
+
+def _build_constellations():
+    """Constellation tables indexed by the integer value of each bit label (MSB first)"""
+    pi = np.pi
+    bpsk = np.array([-1+0j, 1+0j])
+    qpsk = np.array([1+1j, 1-1j, -1+1j, -1-1j]) / np.sqrt(2)
+    psk8 = _ring(1.0, [pi/4, 0, pi, 5*pi/4, pi/2, 7*pi/4, 3*pi/4, 3*pi/2])
+
+    r2 = APSK16_GAMMA
+    apsk16 = np.concatenate([
+        _ring(r2, [pi/4, -pi/4, 3*pi/4, -3*pi/4,
+                   pi/12, -pi/12, 11*pi/12, -11*pi/12,
+                   5*pi/12, -5*pi/12, 7*pi/12, -7*pi/12]),
+        _ring(1.0, [pi/4, -pi/4, 3*pi/4, -3*pi/4]),
+    ])
+
+    r2, r3 = APSK32_GAMMA
+    apsk32 = np.array([
+        (r2, pi/4), (r2, 5*pi/12), (r2, -pi/4), (r2, -5*pi/12),
+        (r2, 3*pi/4), (r2, 7*pi/12), (r2, -3*pi/4), (r2, -7*pi/12),
+        (r3, pi/8), (r3, 3*pi/8), (r3, -pi/4), (r3, -pi/2),
+        (r3, 3*pi/4), (r3, pi/2), (r3, -7*pi/8), (r3, -5*pi/8),
+        (r2, pi/12), (1.0, pi/4), (r2, -pi/12), (1.0, -pi/4),
+        (r2, 11*pi/12), (1.0, 3*pi/4), (r2, -11*pi/12), (1.0, -3*pi/4),
+        (r3, 0), (r3, pi/4), (r3, -pi/8), (r3, -3*pi/8),
+        (r3, 7*pi/8), (r3, 5*pi/8), (r3, pi), (r3, -3*pi/4),
+    ])
+    apsk32 = _ring(apsk32[:, 0], apsk32[:, 1])
+
+    return {
+        "BPSK": bpsk,
+        "QPSK": qpsk,
+        "8PSK": psk8,
+        "16APSK": _normalize(apsk16),
+        "32APSK": _normalize(apsk32),
+    }
+
+
+CONSTELLATIONS = _build_constellations()
+DEFAULT_MODULATION = "QPSK"
+
+
+def bits_per_symbol(modulation_type):
+    """Number of bits carried by one symbol of the given scheme (QPSK if unknown)"""
+    points = CONSTELLATIONS.get(modulation_type, CONSTELLATIONS[DEFAULT_MODULATION])
+    return int(np.log2(len(points)))
+
+
 class Modulator:
     def __init__(self, modulation_type="QPSK"):
         self.modulation_type = modulation_type
-        
-        # Define constellation mappings
-        self.constellations = {
-            "BPSK": {0: -1+0j, 1: 1+0j},
-            "QPSK": {
-                (0,0): (1+1j)/np.sqrt(2),
-                (0,1): (1-1j)/np.sqrt(2),
-                (1,0): (-1+1j)/np.sqrt(2),
-                (1,1): (-1-1j)/np.sqrt(2)
-            }
-        }
-    
+
+        # Unknown schemes fall back to QPSK
+        scheme = modulation_type if modulation_type in CONSTELLATIONS else DEFAULT_MODULATION
+        self.constellation = CONSTELLATIONS[scheme]
+        self.bits_per_symbol = bits_per_symbol(scheme)
+
+        # Bit label of every constellation index, shape (M, bits_per_symbol)
+        shifts = np.arange(self.bits_per_symbol - 1, -1, -1)
+        self._shifts = shifts
+        self._weights = (1 << shifts).astype(np.intp)
+        self.bit_labels = ((np.arange(len(self.constellation))[:, None] >> shifts) & 1).astype(np.int8)
+
+    def bits_to_indices(self, bits):
+        """Pack groups of bits (MSB first) into constellation indices, zero-padding the tail"""
+        bits = np.asarray(bits)
+        k = self.bits_per_symbol
+        if len(bits) % k != 0:
+            bits = np.concatenate([bits, np.zeros(k - len(bits) % k, dtype=bits.dtype)])
+        return bits.reshape(-1, k).astype(np.intp) @ self._weights
+
+    def indices_to_bits(self, indices):
+        """Unpack constellation indices into a flat bit array"""
+        return ((np.asarray(indices)[:, None] >> self._shifts) & 1).reshape(-1)
+
     def modulate(self, bits):
         """Modulate bits to symbols"""
-        if self.modulation_type == "BPSK":
-            symbols = np.array([self.constellations["BPSK"][bit] for bit in bits])
-        elif self.modulation_type == "QPSK":
-            # Group bits into pairs
-            if len(bits) % 2 != 0:
-                bits = np.append(bits, 0)  # Pad if odd number
-            
-            symbols = []
-            for i in range(0, len(bits), 2):
-                symbol_bits = (bits[i], bits[i+1])
-                symbols.append(self.constellations["QPSK"][symbol_bits])
-            
-            symbols = np.array(symbols)
-        else:
-            # Default to QPSK
-            if len(bits) % 2 != 0:
-                bits = np.append(bits, 0)
-            
-            symbols = []
-            for i in range(0, len(bits), 2):
-                symbol_bits = (bits[i], bits[i+1])
-                symbols.append(self.constellations["QPSK"][symbol_bits])
-            
-            symbols = np.array(symbols)
-        
-        return symbols
-    
+        return self.constellation[self.bits_to_indices(bits)]
+
+    def slice_symbols(self, symbols):
+        """Map received symbols to the index of the nearest constellation point"""
+        symbols = np.asarray(symbols)
+
+        # Sign slicing for the axis-aligned schemes
+        if self.bits_per_symbol == 1:
+            return (np.real(symbols) > 0).astype(np.intp)
+        if self.bits_per_symbol == 2:
+            return ((np.real(symbols) < 0).astype(np.intp) << 1) | (np.imag(symbols) < 0)
+
+        # Batched nearest-point search, one block at a time to bound memory
+        indices = np.empty(len(symbols), dtype=np.intp)
+        for start in range(0, len(symbols), DEMAP_BLOCK_SIZE):
+            block = symbols[start:start + DEMAP_BLOCK_SIZE]
+            distances = np.abs(block[:, None] - self.constellation[None, :])
+            indices[start:start + DEMAP_BLOCK_SIZE] = np.argmin(distances, axis=1)
+        return indices
+
     def demodulate(self, symbols):
         """Demodulate symbols to bits"""
-        if self.modulation_type == "BPSK":
-            bits = [1 if np.real(symbol) > 0 else 0 for symbol in symbols]
-        elif self.modulation_type == "QPSK":
-            bits = []
-            for symbol in symbols:
-                # Find closest constellation point
-                min_dist = float('inf')
-                best_bits = None
-                
-                for bit_pair, const_point in self.constellations["QPSK"].items():
-                    dist = np.abs(symbol - const_point)
-                    if dist < min_dist:
-                        min_dist = dist
-                        best_bits = bit_pair
-                
-                bits.extend(best_bits)
-        else:
-            # Default to QPSK demodulation
-            bits = []
-            for symbol in symbols:
-                min_dist = float('inf')
-                best_bits = None
-                
-                for bit_pair, const_point in self.constellations["QPSK"].items():
-                    dist = np.abs(symbol - const_point)
-                    if dist < min_dist:
-                        min_dist = dist
-                        best_bits = bit_pair
-                
-                bits.extend(best_bits)
+        return self.indices_to_bits(self.slice_symbols(symbols))
+
+    def demodulate_soft(self, symbols, noise_var):
+        """Max-log per-bit LLRs, log(P(b=0) / P(b=1)), for complex noise variance noise_var
         
-        return np.array(bits)
\ No newline at end of file
+        noise_var may be a scalar or one value per symbol (e.g. after fading equalization).
+        """
+        symbols = np.asarray(symbols)
+        noise_var = np.broadcast_to(noise_var, (len(symbols),))
+        k = self.bits_per_symbol
+        ones = self.bit_labels.astype(bool)
+
+        llrs = np.empty((len(symbols), k))
+        for start in range(0, len(symbols), DEMAP_BLOCK_SIZE):
+            block = symbols[start:start + DEMAP_BLOCK_SIZE]
+            distances = np.abs(block[:, None] - self.constellation[None, :])**2
+            for i in range(k):
+                d1 = distances[:, ones[:, i]].min(axis=1)
+                d0 = distances[:, ~ones[:, i]].min(axis=1)
+                llrs[start:start + DEMAP_BLOCK_SIZE, i] = (d1 - d0) / noise_var[start:start + DEMAP_BLOCK_SIZE]
+        return llrs.reshape(-1)
+
+    def modulate_stream(self, frames):
+        """Modulate an iterable of bit frames, yielding one symbol frame per input frame"""
+        for frame in frames:
+            yield self.modulate(frame)
+
+    def demodulate_stream(self, frames, noise_var=None):
+        """Demodulate an iterable of symbol frames to hard bits, or to LLRs when noise_var is given"""
+        for frame in frames:
+            if noise_var is None:
+                yield self.demodulate(frame)
+            else:
+                yield self.demodulate_soft(frame, noise_var)
\ No newline at end of file
@@ -0,0 +1,109 @@
+import numpy as np
+from modules.modulation import Modulator
+from modules.channel import SatelliteChannel
+from modules.error_correction import ConvolutionalCode, LDPCCode, create_fec
+from modules.link_budget import LinkBudgetCalculator
+from modules.simulation import theoretical_ber
+from modules.acm import required_ebn0
+
+
+class LinkBatchSimulator:
+    """Many ground stations or carriers simulated as one (links x samples) array
+    
+    Every link shares the config's MODCOD but has its own link budget: any
+    LINK_BUDGET_FIELDS value can be given per link, and each link's Es/N0
+    follows from its C/N0 and symbol rate (or is given directly). Bits,
+    symbols, noise and LLRs for all links go through the chain as single
+    2-D arrays, so the cost grows with the total number of samples rather
+    than with the number of links.
+    """
+    def __init__(self, config):
+        self.config = config
+        self.modulator = Modulator(config.MODULATION_SCHEME)
+        self.fec = create_fec(config)
+    
+    def link_budget(self, **links):
+        """Per-link link budget (LINK_BUDGET_DTYPE) and Es/N0 in dB"""
+        budget = LinkBudgetCalculator(self.config).calculate_batch(required_ebn0=required_ebn0(self.config), **links)
+        symbol_rate = np.asarray(links.get("SYMBOL_RATE", self.config.SYMBOL_RATE), dtype=float)
+        esn0 = budget["cn0"] - 10 * np.log10(symbol_rate)
+        return budget, np.broadcast_to(esn0, budget.shape)
+    
+    def _encode(self, bits):
+        """Encode each row of a (links x bits) array"""
+        if isinstance(self.fec, ConvolutionalCode):
+            return self.fec.encode(bits)
+        if isinstance(self.fec, LDPCCode):
+            # Rows are padded to whole blocks so the flat block sequence splits back into rows
+            padded = np.zeros((len(bits), self.fec.encoded_length(bits.shape[1]) // self.fec.n * self.fec.k),
+                              dtype=bits.dtype)
+            padded[:, :bits.shape[1]] = bits
+            return self.fec.encode(padded.reshape(-1)).reshape(len(bits), -1)
+        return np.repeat(bits, self.fec.repetition, axis=1)
+    
+    def _decode_soft(self, llrs, num_bits):
+        """Decode each row of a (links x coded bits) array of LLRs"""
+        if isinstance(self.fec, ConvolutionalCode):
+            return self.fec.decode_soft(llrs)
+        if isinstance(self.fec, LDPCCode):
+            return self.fec.decode_soft(llrs.reshape(-1)).reshape(len(llrs), -1)[:, :num_bits]
+        sums = llrs.reshape(len(llrs), num_bits, self.fec.repetition).sum(axis=2)
+        return (sums < 0).astype(int)
+    
+    def simulate(self, num_bits, snr_db=None, rng=None, **links):
+        """Send num_bits bits over every link and count the errors per link
+        
+        Link parameters are broadcast 1-D arrays (e.g. DISTANCE=d,
+        GROUND_NOISE_TEMP=t); snr_db, if given, sets each link's Es/N0
+        directly instead, and ebn0 and link_margin then follow from it.
+        Returns a dict of per-link arrays: esn0_db, ebn0, link_margin,
+        errors, bits, ber and the uncoded theoretical BER.
+        """
+        rng = rng if rng is not None else np.random.default_rng(self.config.SEED)
+        budget, esn0 = self.link_budget(**links)
+        esn0 = np.atleast_1d(esn0).astype(float)
+        if snr_db is None:
+            ebn0, link_margin = budget['ebn0'], budget['link_margin']
+        else:
+            snr_db = np.atleast_1d(np.asarray(snr_db, dtype=float))
+            if len(esn0) > 1 and len(snr_db) != len(esn0):
+                raise ValueError(f"snr_db has {len(snr_db)} values for {len(esn0)} links")
+            esn0 = snr_db
+            # Link budget convention: Eb per modulated bit, so Eb/N0 = Es/N0 / bits per symbol
+            ebn0 = esn0 - 10 * np.log10(self.modulator.bits_per_symbol)
+            link_margin = ebn0 - required_ebn0(self.config)
+        num_links = len(esn0)
+        ebn0 = np.broadcast_to(ebn0, (num_links,))
+        link_margin = np.broadcast_to(link_margin, (num_links,))
+        
+        data_bits = rng.integers(0, 2, (num_links, num_bits))
+        encoded_bits = self._encode(data_bits)
+        coded_length = encoded_bits.shape[1]
+        
+        # Pad rows to whole symbols so every row maps to the same number of symbols
+        k = self.modulator.bits_per_symbol
+        padded = np.zeros((num_links, -(-coded_length // k) * k), dtype=encoded_bits.dtype)
+        padded[:, :coded_length] = encoded_bits
+        symbols = self.modulator.modulate(padded.reshape(-1)).reshape(num_links, -1)
+        
+        channel = SatelliteChannel(snr_db=esn0, rng=rng)
+        received = channel.simulate_batch(symbols)
+        
+        noise_var = np.repeat(channel.noise_variance(), symbols.shape[1])
+        llrs = self.modulator.demodulate_soft(received.reshape(-1), noise_var).reshape(num_links, -1)
+        llrs = llrs[:, :coded_length]
+        if self.config.SOFT_DECISION:
+            decoded_bits = self._decode_soft(llrs, num_bits)
+        else:
+            decoded_bits = self._decode_soft(np.where(llrs < 0, -1.0, 1.0), num_bits)
+        
+        errors = np.count_nonzero(decoded_bits[:, :num_bits] != data_bits, axis=1)
+        return {
+            'esn0_db': esn0,
+            'ebn0': ebn0,
+            'link_margin': link_margin,
+            'errors': errors,
+            'bits': np.full(num_links, num_bits),
+            'ber': errors / num_bits,
+            'theoretical_ber': theoretical_ber(self.config.MODULATION_SCHEME, esn0),
+        }
\ No newline at end of file
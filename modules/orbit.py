@@ -0,0 +1,129 @@
+import numpy as np
+from modules.link_budget import LinkBudgetCalculator
+from modules.modulation import bits_per_symbol
+from modules.error_correction import create_fec
+
+EARTH_RADIUS = 6371e3  # meters (spherical Earth)
+EARTH_MU = 3.986004418e14  # m^3/s^2
+EARTH_ROTATION_RATE = 7.2921159e-5  # rad/s
+SPEED_OF_LIGHT = 3e8  # m/s
+
+
+class PassSimulator:
+    def __init__(self, config):
+        self.config = config
+        self.radius = EARTH_RADIUS + config.ORBIT_ALTITUDE
+        self.mean_motion = np.sqrt(EARTH_MU / self.radius**3)
+        self.inclination = np.radians(config.ORBIT_INCLINATION)
+        self.latitude = np.radians(config.GROUND_LATITUDE)
+        self.longitude = np.radians(config.GROUND_LONGITUDE)
+    
+    @property
+    def orbital_period(self):
+        return 2 * np.pi / self.mean_motion
+    
+    def overhead_elements(self, t_mid):
+        """RAAN and initial argument of latitude for a pass closest to overhead at t_mid
+        
+        Only possible when the orbit reaches the station latitude; otherwise
+        the satellite passes at its highest latitude instead. An equatorial
+        orbit (inclination 0 or 180 deg) crosses the station's meridian at
+        argument of latitude 0.
+        """
+        sin_i = np.sin(self.inclination)
+        if abs(sin_i) < 1e-12:
+            u_cross = 0.0
+        else:
+            u_cross = np.arcsin(np.clip(np.sin(self.latitude) / sin_i, -1, 1))
+        node_offset = np.arctan2(np.cos(self.inclination) * np.sin(u_cross), np.cos(u_cross))
+        raan = self.longitude + EARTH_ROTATION_RATE * t_mid - node_offset
+        return raan, u_cross - self.mean_motion * t_mid
+    
+    def satellite_state(self, t, raan, u0):
+        """ECI position and velocity of the satellite, each of shape (len(t), 3)"""
+        u = u0 + self.mean_motion * t
+        cos_u, sin_u = np.cos(u), np.sin(u)
+        cos_o, sin_o = np.cos(raan), np.sin(raan)
+        cos_i, sin_i = np.cos(self.inclination), np.sin(self.inclination)
+        
+        position = self.radius * np.stack([
+            cos_o * cos_u - sin_o * sin_u * cos_i,
+            sin_o * cos_u + cos_o * sin_u * cos_i,
+            sin_u * sin_i,
+        ], axis=-1)
+        velocity = self.radius * self.mean_motion * np.stack([
+            -cos_o * sin_u - sin_o * cos_u * cos_i,
+            -sin_o * sin_u + cos_o * cos_u * cos_i,
+            cos_u * sin_i,
+        ], axis=-1)
+        return position, velocity
+    
+    def station_state(self, t):
+        """ECI position and velocity of the rotating ground station"""
+        theta = self.longitude + EARTH_ROTATION_RATE * t
+        cos_lat = np.cos(self.latitude)
+        position = EARTH_RADIUS * np.stack([
+            cos_lat * np.cos(theta),
+            cos_lat * np.sin(theta),
+            np.full_like(theta, np.sin(self.latitude)),
+        ], axis=-1)
+        velocity = EARTH_ROTATION_RATE * np.stack([
+            -position[:, 1], position[:, 0], np.zeros_like(theta),
+        ], axis=-1)
+        return position, velocity
+    
+    def geometry(self, t, raan, u0):
+        """Slant range (m), elevation (deg) and Doppler shift (Hz) on the time grid t"""
+        sat_pos, sat_vel = self.satellite_state(t, raan, u0)
+        gs_pos, gs_vel = self.station_state(t)
+        
+        rho = sat_pos - gs_pos
+        slant_range = np.linalg.norm(rho, axis=1)
+        zenith = gs_pos / EARTH_RADIUS
+        # Rounding can push the sine just past 1 at an overhead culmination
+        elevation = np.degrees(np.arcsin(np.clip(np.sum(rho * zenith, axis=1) / slant_range, -1.0, 1.0)))
+        range_rate = np.sum(rho * (sat_vel - gs_vel), axis=1) / slant_range
+        doppler = -self.config.FREQUENCY * range_rate / SPEED_OF_LIGHT
+        return slant_range, elevation, doppler
+    
+    def simulate(self, duration=None, time_step=1.0, required_ebn0=9.6):
+        """Link budget over one pass on a vectorized time grid
+        
+        Without ORBIT_RAAN/ORBIT_ARG_LATITUDE in the config the orbit is phased
+        for a pass centred on the middle of the window. Atmospheric loss scales
+        with the cosecant of elevation from its zenith value ATMOSPHERIC_LOSS.
+        Returns a dict of per-timestep arrays plus the pass summary.
+        """
+        duration = duration if duration is not None else self.orbital_period / 4
+        t = np.arange(0, duration, time_step)
+        
+        if self.config.ORBIT_RAAN is None or self.config.ORBIT_ARG_LATITUDE is None:
+            raan, u0 = self.overhead_elements(t[-1] / 2)
+        else:
+            raan, u0 = np.radians(self.config.ORBIT_RAAN), np.radians(self.config.ORBIT_ARG_LATITUDE)
+        
+        slant_range, elevation, doppler = self.geometry(t, raan, u0)
+        visible = elevation >= self.config.MIN_ELEVATION
+        
+        atmospheric_loss = self.config.ATMOSPHERIC_LOSS / np.sin(np.radians(np.maximum(elevation, self.config.MIN_ELEVATION)))
+        budget = LinkBudgetCalculator(self.config).calculate_batch(
+            required_ebn0=required_ebn0, DISTANCE=slant_range, ATMOSPHERIC_LOSS=atmospheric_loss)
+        
+        # Data flows only while the station sees the satellite with positive margin
+        info_rate = self.config.SYMBOL_RATE * bits_per_symbol(self.config.MODULATION_SCHEME) * create_fec(self.config).rate
+        usable = visible & (budget["link_margin"] >= 0)
+        
+        return {
+            "time": t,
+            "slant_range": slant_range,
+            "elevation": elevation,
+            "doppler": doppler,
+            "atmospheric_loss": atmospheric_loss,
+            "ebn0": budget["ebn0"],
+            "link_margin": budget["link_margin"],
+            "visible": visible,
+            "usable": usable,
+            "visible_time": np.count_nonzero(visible) * time_step,
+            "usable_time": np.count_nonzero(usable) * time_step,
+            "data_volume": np.count_nonzero(usable) * time_step * info_rate,  # bits
+        }
\ No newline at end of file
@@ -0,0 +1,125 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+_DISABLED = nullcontext()
+
+
+class Profiler:
+    """Wall-time, sample-count and allocation high-water-mark records per stage
+    
+    stage() returns a shared no-op context when the profiler is disabled, so
+    leaving the hooks in place costs one attribute check per stage. Stages
+    may nest; each one's peak is the most memory allocated above what was
+    in use when it started, as seen by tracemalloc. Tracing every allocation
+    slows allocation-heavy loops such as the Viterbi decoder several times
+    over, so memory=False keeps the timings honest when peaks are not needed.
+    """
+    def __init__(self, enabled=True, memory=True):
+        self.enabled = enabled
+        self.memory = memory
+        self.records = []
+        self._open = []
+        self._origin = time.perf_counter()
+    
+    def stage(self, name, samples=0):
+        """Context manager recording one stage that processes `samples` items"""
+        if not self.enabled:
+            return _DISABLED
+        return self._stage(name, samples)
+    
+    @contextmanager
+    def _stage(self, name, samples):
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        self._flush_peak()
+        record = {
+            "name": name,
+            "samples": int(samples),
+            "depth": len(self._open),
+            "start": time.perf_counter() - self._origin,
+            "peak_bytes": 0,
+            "_base": tracemalloc.get_traced_memory()[0] if self.memory else 0,
+        }
+        self._open.append(record)
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - self._origin - record["start"]
+            self._flush_peak()
+            self._open.pop()
+            del record["_base"]
+            self.records.append(record)
+            if started_tracing:
+                tracemalloc.stop()
+    
+    def _flush_peak(self):
+        """Fold the peak since the last reset into every open stage, then reset it"""
+        if not self.memory or not tracemalloc.is_tracing():
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for record in self._open:
+            record["peak_bytes"] = max(record["peak_bytes"], peak - record["_base"])
+        tracemalloc.reset_peak()
+    
+    def wrap(self, target, prefix=None):
+        """Proxy that records every public method call of target as a stage"""
+        if not self.enabled:
+            return target
+        return _Instrumented(target, self, prefix or type(target).__name__)
+    
+    def summary(self):
+        """Records in start order, with throughput where samples were given"""
+        rows = []
+        for record in sorted(self.records, key=lambda r: r["start"]):
+            row = {
+                "stage": "  " * record["depth"] + record["name"],
+                "seconds": record["seconds"],
+                "samples": record["samples"],
+                "peak_mb": record["peak_bytes"] / 2**20,
+            }
+            row["msamples_per_s"] = record["samples"] / record["seconds"] / 1e6 if record["samples"] and record["seconds"] > 0 else None
+            rows.append(row)
+        return rows
+    
+    def trace(self):
+        """Chrome trace-event JSON (open in chrome://tracing or Perfetto)"""
+        events = [{
+            "name": record["name"],
+            "ph": "X",
+            "ts": record["start"] * 1e6,
+            "dur": record["seconds"] * 1e6,
+            "pid": 0,
+            "tid": 0,
+            "args": {"samples": record["samples"], "peak_bytes": record["peak_bytes"]},
+        } for record in self.records]
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, indent=2)
+    
+    def export(self, path):
+        with open(path, "w") as f:
+            f.write(self.trace())
+
+
+class _Instrumented:
+    """Method-call proxy created by Profiler.wrap"""
+    def __init__(self, target, profiler, prefix):
+        self._target = target
+        self._profiler = profiler
+        self._prefix = prefix
+    
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        
+        def timed(*args, **kwargs):
+            with self._profiler.stage(f"{self._prefix}.{name}"):
+                return attribute(*args, **kwargs)
+        return timed
+
+
+def profile(profiler, name, samples=0):
+    """profiler.stage(), or a no-op when no profiler is given"""
+    return profiler.stage(name, samples) if profiler is not None else _DISABLED
\ No newline at end of file
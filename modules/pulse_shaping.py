@@ -0,0 +1,160 @@
+import numpy as np
+
+
+def rrc_taps(rolloff, samples_per_symbol, span):
+    """Unit-energy root-raised-cosine taps spanning `span` symbols"""
+    t = np.arange(-span * samples_per_symbol / 2, span * samples_per_symbol / 2 + 1) / samples_per_symbol
+    beta = rolloff
+    taps = np.empty(len(t))
+    
+    zero = np.isclose(t, 0)
+    special = np.isclose(np.abs(t), 1 / (4 * beta)) if beta > 0 else np.zeros(len(t), dtype=bool)
+    regular = ~zero & ~special
+    
+    taps[zero] = 1 + beta * (4 / np.pi - 1)
+    if special.any():
+        taps[special] = beta / np.sqrt(2) * ((1 + 2 / np.pi) * np.sin(np.pi / (4 * beta)) +
+                                             (1 - 2 / np.pi) * np.cos(np.pi / (4 * beta)))
+    tr = t[regular]
+    taps[regular] = ((np.sin(np.pi * tr * (1 - beta)) + 4 * beta * tr * np.cos(np.pi * tr * (1 + beta))) /
+                     (np.pi * tr * (1 - (4 * beta * tr)**2)))
+    return taps / np.sqrt(np.sum(taps**2))
+
+
+class OverlapSaveFilter:
+    """FIR filter applied with FFT overlap-save in fixed-size blocks
+    
+    process() is stateful, so a long signal can be fed as consecutive frames
+    and the output matches one full-length convolution.
+    """
+    def __init__(self, taps, block_size=None):
+        self.taps = np.asarray(taps)
+        self.overlap = len(self.taps) - 1
+        if block_size is None:
+            block_size = 1 << int(np.ceil(np.log2(max(8 * len(self.taps), 64))))
+        self.nfft = block_size
+        self.step = self.nfft - self.overlap
+        if self.step <= 0:
+            raise ValueError("block_size must exceed the number of taps")
+        self.response = np.fft.fft(self.taps, self.nfft)
+        self.reset()
+    
+    def reset(self):
+        """Clear the history carried between blocks"""
+        self.history = np.zeros(self.overlap, dtype=complex)
+    
+    def process(self, block):
+        """Filter the next block of samples, returning len(block) output samples"""
+        block = np.asarray(block)
+        n = len(block)
+        segments = -(-n // self.step)
+        x = np.zeros(segments * self.step + self.overlap, dtype=complex)
+        x[:self.overlap] = self.history
+        x[self.overlap:self.overlap + n] = block
+        
+        # Every overlapping segment goes through one batched FFT
+        index = np.arange(segments)[:, None] * self.step + np.arange(self.nfft)[None, :]
+        y = np.fft.ifft(np.fft.fft(x[index], axis=1) * self.response, axis=1)[:, self.overlap:]
+        
+        if self.overlap:
+            self.history = x[n:n + self.overlap].copy()
+        return y.reshape(-1)[:n]
+    
+    def filter(self, signal):
+        """Full linear convolution of a whole signal, computed block by block"""
+        self.reset()
+        out = self.process(np.concatenate([np.asarray(signal), np.zeros(self.overlap)]))
+        self.reset()
+        return out
+
+
+class PulseShaper:
+    def __init__(self, rolloff=0.35, samples_per_symbol=4, span=10):
+        self.rolloff = rolloff
+        self.samples_per_symbol = samples_per_symbol
+        self.span = span
+        self.taps = rrc_taps(rolloff, samples_per_symbol, span)
+        # Transmit and matched filter together delay the signal by this many samples
+        self.delay = len(self.taps) - 1
+    
+    def _upsample(self, symbols):
+        upsampled = np.zeros(len(symbols) * self.samples_per_symbol, dtype=complex)
+        upsampled[::self.samples_per_symbol] = symbols
+        return upsampled
+    
+    def transmit(self, symbols):
+        """Upsample and RRC-filter symbols; output includes the filter tail"""
+        return OverlapSaveFilter(self.taps).filter(self._upsample(symbols))
+    
+    def receive(self, samples, num_symbols=None):
+        """Matched-filter and decimate to one sample per symbol at the optimum instant"""
+        filtered = OverlapSaveFilter(self.taps).filter(samples)
+        symbols = filtered[self.delay::self.samples_per_symbol]
+        if num_symbols is None:
+            num_symbols = (len(samples) - self.delay) // self.samples_per_symbol
+        return symbols[:num_symbols]
+    
+    def sample_snr_db(self, snr_db):
+        """Per-sample SNR that yields an Es/N0 of snr_db after the matched filter"""
+        return snr_db - 10 * np.log10(self.samples_per_symbol)
+    
+    def simulate(self, symbols, channel, symbol_rate):
+        """Transmit filter -> channel at the sample rate -> matched filter and decimator
+        
+        The channel's snr_db is taken as Es/N0, as in the one-sample-per-symbol
+        chain, so the same noise variance applies to the recovered symbols.
+        Returns (transmitted samples, received symbols).
+        """
+        samples = self.transmit(symbols)
+        es_n0 = channel.snr_db
+        channel.snr_db = self.sample_snr_db(es_n0)
+        try:
+            received = channel.simulate_channel(samples, sample_rate=symbol_rate * self.samples_per_symbol)
+        finally:
+            channel.snr_db = es_n0
+        return samples, self.receive(received, len(symbols))
+    
+    def transmit_stream(self, frames):
+        """Pulse-shape an iterable of symbol frames, yielding samples_per_symbol samples per symbol"""
+        shaping = OverlapSaveFilter(self.taps)
+        for frame in frames:
+            yield shaping.process(self._upsample(frame))
+    
+    def receive_stream(self, sample_frames):
+        """Matched-filter and decimate a continuous sample stream frame by frame
+        
+        Symbols lag the input by the combined filter delay, so each output frame
+        holds the symbols completed so far rather than a fixed count.
+        """
+        matched = OverlapSaveFilter(self.taps)
+        position = 0  # index of the next input sample in the whole stream
+        for frame in sample_frames:
+            filtered = matched.process(frame)
+            first = max(self.delay - position, 0)
+            first += (self.delay - position - first) % self.samples_per_symbol
+            yield filtered[first::self.samples_per_symbol]
+            position += len(frame)
+
+
+def spectrum(samples, sample_rate, nfft=1024):
+    """Welch power spectral density (Hann window, 50% overlap), frequencies centred on 0"""
+    samples = np.asarray(samples)
+    nfft = min(nfft, len(samples))
+    hop = nfft // 2
+    segments = 1 + (len(samples) - nfft) // hop
+    window = np.hanning(nfft)
+    index = np.arange(segments)[:, None] * hop + np.arange(nfft)[None, :]
+    
+    periodograms = np.abs(np.fft.fft(samples[index] * window, axis=1))**2
+    psd = np.fft.fftshift(periodograms.mean(axis=0)) / (sample_rate * np.sum(window**2))
+    freqs = np.fft.fftshift(np.fft.fftfreq(nfft, d=1 / sample_rate))
+    return freqs, psd
+
+
+def occupied_bandwidth(freqs, psd, fraction=0.99):
+    """Bandwidth holding `fraction` of the total power, trimming equal tails each side"""
+    cumulative = np.cumsum(psd) / np.sum(psd)
+    tail = (1 - fraction) / 2
+    low = freqs[np.searchsorted(cumulative, tail)]
+    high = freqs[min(np.searchsorted(cumulative, 1 - tail), len(freqs) - 1)]
+    return high - low
\ No newline at end of file
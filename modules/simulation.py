@@ -0,0 +1,430 @@
+import copy
+import math
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from modules.modulation import Modulator
+from modules.channel import SatelliteChannel
+from modules.error_correction import create_fec
+from modules.pulse_shaping import PulseShaper
+from modules.fading import create_fading
+from modules.profiling import profile
+
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+
+def q_function(x):
+    """Gaussian tail probability Q(x)"""
+    return 0.5 * _erfc(np.asarray(x, dtype=float) / np.sqrt(2))
+
+
+def theoretical_ber(modulation_type, snr_db):
+    """Uncoded AWGN BER for each SNR (Es/N0, dB) point
+
+    Exact for BPSK and Gray-mapped QPSK; a pairwise union bound over the
+    constellation (clipped to 0.5) for the higher-order schemes.
+    """
+    snr_db = np.atleast_1d(np.asarray(snr_db, dtype=float))
+    esn0 = 10**(snr_db / 10)
+    modulator = Modulator(modulation_type)
+    k = modulator.bits_per_symbol
+
+    if k == 1:
+        return q_function(np.sqrt(2 * esn0))
+    if k == 2:
+        return q_function(np.sqrt(esn0))
+
+    points = modulator.constellation
+    distances = np.abs(points[:, None] - points[None, :])
+    hamming = (modulator.bit_labels[:, None, :] != modulator.bit_labels[None, :, :]).sum(axis=2)
+    pairs = ~np.eye(len(points), dtype=bool)
+    d, h = distances[pairs], hamming[pairs]
+
+    # Noise standard deviation per real dimension is sqrt(N0 / 2) with unit Es
+    sigma = np.sqrt(1 / (2 * esn0))
+    ber = (h[None, :] * q_function(d[None, :] / (2 * sigma[:, None]))).sum(axis=1) / (len(points) * k)
+    return np.minimum(ber, 0.5)
+
+
+def frame_sizes(total_bits, frame_bits):
+    """Yield frame_bits-sized frame lengths (the last one trimmed) up to total_bits"""
+    sent = 0
+    while sent < total_bits:
+        size = int(min(frame_bits, total_bits - sent))
+        yield size
+        sent += size
+
+
+def bit_frames(total_bits, frame_bits, rng):
+    """Yield random data frames of frame_bits bits (the last one trimmed) up to total_bits"""
+    for size in frame_sizes(total_bits, frame_bits):
+        yield rng.integers(0, 2, size)
+
+
+class BERAccumulator:
+    """Running error and bit counts over a stream of frames"""
+    def __init__(self):
+        self.errors = 0
+        self.bits = 0
+        self.frames = 0
+    
+    def update(self, sent_bits, decoded_bits):
+        """Count errors in one frame; decoded padding beyond the sent bits is ignored"""
+        self.errors += int(np.sum(sent_bits != decoded_bits[:len(sent_bits)]))
+        self.bits += len(sent_bits)
+        self.frames += 1
+    
+    @property
+    def ber(self):
+        return self.errors / self.bits if self.bits > 0 else 0
+
+
+def _run_frames(config, entropy, point, snr_db, first_frame, num_frames):
+    """Process-pool entry point: error count of each frame in a contiguous block"""
+    simulator = BERSimulator(config)
+    return [simulator.run_frame(snr_db, frame, simulator.frame_rng(entropy, point, frame))
+            for frame in range(first_frame, first_frame + num_frames)]
+
+
+def _sweep_config(config, snr_values):
+    """Copy of config whose SWEEP_SNR_DB is the grid actually swept
+    
+    A stored sweep run is keyed on SWEEP_SNR_DB, and its points are matched
+    by index, so the key must describe the SNR values the points belong to.
+    """
+    config = copy.copy(config)
+    config.SWEEP_SNR_DB = np.asarray(snr_values, dtype=float).tolist()
+    return config
+
+
+class SweepProgress:
+    """Error and bit counts of one BER sweep, resumed from a ResultStore run
+    
+    Shared by BERSimulator.sweep and the job service: with a store, the
+    points already recorded are loaded, the rest are drawn from the run's
+    stored entropy, and every point is saved as soon as it is recorded.
+    """
+    def __init__(self, simulator, snr_values, store=None):
+        self.snr_values = np.asarray(snr_values, dtype=float)
+        self.config = simulator.config
+        self.errors = np.zeros(len(self.snr_values), dtype=np.int64)
+        self.bits = np.zeros(len(self.snr_values), dtype=np.int64)
+        self.run = None
+        if store is not None:
+            self.run = store.open_run("sweep", _sweep_config(self.config, self.snr_values))
+            self.entropy = int(self.run.entropy)
+            for i in range(len(self.snr_values)):
+                stored = self.run.point(i)
+                if stored is not None:
+                    self.errors[i], self.bits[i] = stored['errors'], stored['bits']
+        else:
+            self.entropy = simulator.entropy()
+        self._done = self.bits > 0
+    
+    @property
+    def complete(self):
+        """Whether the store already holds the finished result"""
+        return self.run is not None and self.run.complete
+    
+    def stored_result(self):
+        return self.run.load_result()
+    
+    def pending(self):
+        """Indices of the points still to simulate"""
+        return [int(i) for i in np.flatnonzero(~self._done)]
+    
+    def record(self, i, errors, bits):
+        self.errors[i], self.bits[i] = errors, bits
+        self._done[i] = True
+        if self.run is not None:
+            self.run.record_point(i, snr_db=self.snr_values[i], errors=errors, bits=bits)
+    
+    def partial(self):
+        """Counts of the points finished so far"""
+        done = self._done
+        return {
+            'snr_db': self.snr_values[done],
+            'ber': self.errors[done] / np.maximum(self.bits[done], 1),
+            'errors': self.errors[done].copy(),
+            'bits': self.bits[done].copy(),
+        }
+    
+    def result(self):
+        """Final sweep result, saved to the store when there is one"""
+        results = {
+            'snr_db': self.snr_values,
+            'ber': self.errors / np.maximum(self.bits, 1),
+            'theoretical_ber': theoretical_ber(self.config.MODULATION_SCHEME, self.snr_values),
+            'errors': self.errors,
+            'bits': self.bits,
+        }
+        if self.run is not None:
+            self.run.save_result(results)
+        return results
+
+
+def run_chain(config, store=None, profiler=None):
+    """One seeded pass of NUM_BITS bits through the whole chain at SNR_DB
+    
+    Returns a dict with the transmitted and received symbols, the pulse-shaped
+    samples (None without pulse shaping), the error count and BER, and the
+    LDPC decoder statistics when that code is in use. With a ResultStore a
+    stored result for the same config is loaded memory-mapped instead, and
+    a new one is drawn from the stored run's entropy, so it can be
+    reproduced from the run record even without SEED. A Profiler records
+    each stage of the chain.
+    """
+    if store is not None:
+        run = store.open_run("simulation", config)
+        if run.complete:
+            return run.load_result()
+        result = _simulate_chain(config, int(run.entropy), profiler)
+        run.save_result(result)
+        return result
+    return _simulate_chain(config, config.SEED, profiler)
+
+
+def _simulate_chain(config, seed, profiler=None):
+    """The chain of run_chain, drawn from np.random.default_rng(seed)"""
+    rng = np.random.default_rng(seed)
+    modulator = Modulator(config.MODULATION_SCHEME)
+    channel = SatelliteChannel(snr_db=config.SNR_DB, rng=rng)
+    fec = create_fec(config)
+    
+    data_bits = rng.integers(0, 2, config.NUM_BITS)
+    with profile(profiler, "fec.encode", len(data_bits)):
+        encoded_bits = fec.encode(data_bits)
+    with profile(profiler, "modulate", len(encoded_bits)):
+        symbols = modulator.modulate(encoded_bits)
+    tx_samples = None
+    if config.PULSE_SHAPING:
+        with profile(profiler, "pulse_shaping+channel", len(symbols) * config.SAMPLES_PER_SYMBOL):
+            shaper = PulseShaper(config.ROLLOFF_FACTOR, config.SAMPLES_PER_SYMBOL, config.RRC_SPAN)
+            tx_samples, received_symbols = shaper.simulate(symbols, channel, config.SYMBOL_RATE)
+    else:
+        with profile(profiler, "channel", len(symbols)):
+            received_symbols = channel.simulate_channel(symbols)
+    if config.SOFT_DECISION:
+        with profile(profiler, "demodulate_soft", len(received_symbols)):
+            llrs = modulator.demodulate_soft(received_symbols, channel.noise_variance())
+        with profile(profiler, "fec.decode_soft", len(encoded_bits)):
+            decoded_bits = fec.decode_soft(llrs[:len(encoded_bits)])
+    else:
+        with profile(profiler, "demodulate", len(received_symbols)):
+            received_bits = modulator.demodulate(received_symbols)
+        with profile(profiler, "fec.decode", len(encoded_bits)):
+            decoded_bits = fec.decode(received_bits[:len(encoded_bits)])
+    decoded_bits = decoded_bits[:len(data_bits)]
+    
+    return {
+        'symbols': symbols,
+        'received_symbols': received_symbols,
+        'tx_samples': tx_samples,
+        'errors': int(np.sum(data_bits != decoded_bits)),
+        'ber': fec.calculate_ber(data_bits, decoded_bits),
+        'ldpc_stats': dict(fec.stats) if config.FEC_TYPE == "LDPC" else None,
+    }
+
+
+class BERSimulator:
+    def __init__(self, config):
+        self.config = config
+        self.modulator = Modulator(config.MODULATION_SCHEME)
+        self.fec = create_fec(config)
+        self.channel = None
+        self.shaper = None
+        if config.PULSE_SHAPING:
+            self.shaper = PulseShaper(config.ROLLOFF_FACTOR, config.SAMPLES_PER_SYMBOL, config.RRC_SPAN)
+    
+    @staticmethod
+    def frame_rng(entropy, point, frame):
+        """Independent Generator for one frame of one SNR point
+        
+        Streams are keyed by (point, frame) rather than by worker, so a seed
+        gives bit-identical results for any number of workers.
+        """
+        return np.random.Generator(np.random.PCG64(np.random.SeedSequence(entropy, spawn_key=(point, frame))))
+    
+    def max_frames(self):
+        """Number of frames needed to spend the MAX_BITS budget"""
+        return int(math.ceil(self.config.MAX_BITS / self.config.FRAME_BITS))
+    
+    def frame_bits(self, frame):
+        """Size of a given frame; the last one is trimmed to the bit budget"""
+        return int(min(self.config.FRAME_BITS, self.config.MAX_BITS - frame * self.config.FRAME_BITS))
+    
+    def _channel(self, snr_db, rng):
+        """Channel for one frame; the buffered complex64 channel is reused across frames"""
+        if not self.config.CHANNEL_BUFFERED:
+            return SatelliteChannel(snr_db=snr_db, rng=rng)
+        if self.channel is None:
+            self.channel = SatelliteChannel(snr_db=snr_db, rng=rng, buffered=True)
+        self.channel.snr_db = snr_db
+        self.channel.rng = rng
+        return self.channel
+    
+    def run_frame(self, snr_db, frame, rng):
+        """Push one frame through encode -> modulate -> channel -> demodulate -> decode
+
+        Returns the number of bit errors in the frame.
+        """
+        channel = self._channel(snr_db, rng)
+        data_bits = rng.integers(0, 2, self.frame_bits(frame))
+        encoded_bits = self.fec.encode(data_bits)
+        symbols = self.modulator.modulate(encoded_bits)
+        if self.shaper is not None:
+            _, received_symbols = self.shaper.simulate(symbols, channel, self.config.SYMBOL_RATE)
+        else:
+            received_symbols = channel.simulate_channel(symbols)
+        
+        if self.config.SOFT_DECISION:
+            llrs = self.modulator.demodulate_soft(received_symbols, channel.noise_variance())
+            decoded_bits = self.fec.decode_soft(llrs[:len(encoded_bits)])
+        else:
+            received_bits = self.modulator.demodulate(received_symbols)
+            decoded_bits = self.fec.decode(received_bits[:len(encoded_bits)])
+        
+        # Block codes decode whole blocks; drop the zero padding of the last one
+        return int(np.sum(data_bits != decoded_bits[:len(data_bits)]))
+    
+    def _point_done(self, errors, frames):
+        return errors >= self.config.TARGET_ERRORS or frames >= self.max_frames()
+    
+    def simulate_point(self, snr_db, point=0, entropy=None):
+        """Run frames at one SNR until TARGET_ERRORS errors or MAX_BITS bits
+
+        Returns (errors, bits) counted at that point.
+        """
+        if entropy is None:
+            entropy = self.entropy()
+        errors, bits, frame = 0, 0, 0
+        while not self._point_done(errors, frame):
+            errors += self.run_frame(snr_db, frame, self.frame_rng(entropy, point, frame))
+            bits += self.frame_bits(frame)
+            frame += 1
+        return errors, bits
+    
+    def entropy(self):
+        """Seed entropy for a new sweep: SEED when set, fresh entropy otherwise
+        
+        Frame streams are spawned from it per (point, frame), so the same
+        entropy reproduces a sweep on any worker count or process.
+        """
+        if self.config.SEED is not None:
+            return self.config.SEED
+        return np.random.SeedSequence().entropy
+    
+    def _frames_to_dispatch(self, errors, frames, workers, active):
+        """How many more frames to queue for a point this round"""
+        cap = max(1, 4 * workers // active)
+        if frames == 0:
+            want = max(1, workers // active)
+        elif errors == 0:
+            want = cap
+        else:
+            # Extrapolate the frames still needed from the error rate so far
+            want = int(math.ceil((self.config.TARGET_ERRORS - errors) * frames / errors))
+        return max(1, min(want, cap, self.max_frames() - frames))
+    
+    def _parallel_sweep(self, snr_values, entropy, workers, points=None, on_point=None):
+        """Sweep the given point indices (all by default) on a process pool
+        
+        on_point(i, errors, bits) is called as soon as each point finishes.
+        """
+        n = len(snr_values)
+        errors = np.zeros(n, dtype=np.int64)
+        bits = np.zeros(n, dtype=np.int64)
+        frames = np.zeros(n, dtype=np.int64)
+        done = np.ones(n, dtype=bool)
+        done[np.arange(n) if points is None else np.asarray(points, dtype=int)] = False
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while not done.all():
+                active = np.flatnonzero(~done)
+                tasks_per_point = max(1, 2 * workers // len(active))
+                tasks = []
+                for i in active:
+                    count = self._frames_to_dispatch(errors[i], frames[i], workers, len(active))
+                    block = int(math.ceil(count / tasks_per_point))
+                    for first in range(frames[i], frames[i] + count, block):
+                        size = min(block, frames[i] + count - first)
+                        tasks.append((i, pool.submit(_run_frames, self.config, entropy, int(i),
+                                                     snr_values[i], int(first), int(size))))
+                
+                # Merge in (point, frame) order and apply the same stopping rule as
+                # the sequential path; frames queued past the stop point are discarded
+                for i, future in tasks:
+                    for frame_errors in future.result():
+                        if done[i]:
+                            break
+                        errors[i] += frame_errors
+                        bits[i] += self.frame_bits(frames[i])
+                        frames[i] += 1
+                        done[i] = self._point_done(errors[i], frames[i])
+                        if done[i] and on_point is not None:
+                            on_point(i, errors[i], bits[i])
+        
+        return errors, bits
+    
+    def sweep(self, snr_values, workers=None, store=None):
+        """Monte Carlo BER vs SNR sweep
+
+        Frames run on a process pool when workers > 1 (WORKERS by default).
+        With a ResultStore, every finished point is saved at once and a
+        rerun of the same config skips the points already stored, drawing
+        the rest from the same seed entropy.
+        Returns a dict with the SNR points, simulated and theoretical BER,
+        and the error and bit counts behind each simulated point.
+        """
+        workers = workers if workers is not None else self.config.WORKERS
+        progress = SweepProgress(self, snr_values, store)
+        if progress.complete:
+            return progress.stored_result()
+        pending = progress.pending()
+        
+        if workers > 1 and pending:
+            self._parallel_sweep(progress.snr_values, progress.entropy, workers, pending, progress.record)
+        else:
+            for i in pending:
+                progress.record(i, *self.simulate_point(progress.snr_values[i], point=i, entropy=progress.entropy))
+        return progress.result()
+    
+    def _equalized_demodulation(self, channel, frames, noise_var):
+        """Demodulate faded frames after equalizing each with the channel's last gains"""
+        for frame in frames:
+            symbols, scale = channel.equalize(frame)
+            if noise_var is None:
+                yield self.modulator.demodulate(symbols)
+            else:
+                yield self.modulator.demodulate_soft(symbols, noise_var * scale)
+    
+    def stream(self, snr_db, total_bits, rng=None):
+        """Frame-by-frame simulation of total_bits bits with bounded memory
+        
+        Every stage consumes and yields FRAME_BITS-sized frames, so only a few
+        frames are alive at once however long the run. Fading and rain fade
+        from the config continue across frames and are removed with perfect
+        CSI before demodulation. Yields the running BERAccumulator after each
+        frame.
+        """
+        rng = rng if rng is not None else np.random.default_rng(self.config.SEED)
+        channel = SatelliteChannel(snr_db=snr_db, rng=rng, buffered=self.config.CHANNEL_BUFFERED,
+                                   fading=create_fading(self.config, self.config.SYMBOL_RATE, rng))
+        noise_var = channel.noise_variance() if self.config.SOFT_DECISION else None
+        
+        # tee keeps the sent frames for comparison; zip consumes both sides in
+        # lockstep, so it never buffers more than one frame
+        sent, source = itertools.tee(bit_frames(total_bits, self.config.FRAME_BITS, rng))
+        encoded = self.fec.encode_stream(source)
+        received = channel.stream(self.modulator.modulate_stream(encoded))
+        if channel.fading:
+            demodulated = self._equalized_demodulation(channel, received, noise_var)
+        else:
+            demodulated = self.modulator.demodulate_stream(received, noise_var)
+        decoded = self.fec.decode_stream(demodulated, soft=self.config.SOFT_DECISION,
+                                         frame_bits=frame_sizes(total_bits, self.config.FRAME_BITS))
+        
+        accumulator = BERAccumulator()
+        for sent_bits, decoded_bits in zip(sent, decoded):
+            accumulator.update(sent_bits, decoded_bits)
+            yield accumulator
\ No newline at end of file
@@ -0,0 +1,188 @@
+import json
+import os
+import tempfile
+import time
+import numpy as np
+from modules.cache import STAGE_FIELDS, canonical_config, config_fingerprint
+
+META_FILE = "run.json"
+
+
+def _write_json(path, payload):
+    """Write JSON atomically, so a crash never leaves a half-written file behind
+    
+    Each write goes through its own temporary file in the target directory,
+    so concurrent writers never collide; the last os.replace wins.
+    """
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w") as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def _write_array(path, array):
+    """np.save through a temporary file, atomically like _write_json"""
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as f:
+            np.save(f, array)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+class StoredRun:
+    """One stored stage result: per-point counts, scalars and .npy arrays
+    
+    Counts and scalars live in a small JSON file that is rewritten after
+    every point, so a killed sweep loses at most the point in progress.
+    Arrays are plain .npy files opened memory-mapped, which makes loading
+    a stored curve or symbol set instant whatever its size.
+    """
+    def __init__(self, store, stage, key, directory, meta):
+        self.store = store
+        self.stage = stage
+        self.key = key
+        self.directory = directory
+        self.meta = meta
+    
+    @property
+    def entropy(self):
+        """Seed entropy the run was started with; resuming must reuse it"""
+        return self.meta["entropy"]
+    
+    @property
+    def complete(self):
+        return self.meta["complete"]
+    
+    def point(self, index):
+        """Stored counts of a completed point, or None"""
+        return self.meta["points"].get(str(index))
+    
+    def record_point(self, index, **counts):
+        self.meta["points"][str(index)] = {name: _plain(value) for name, value in counts.items()}
+        self._save()
+    
+    def save_result(self, result):
+        """Store a result dict: arrays as .npy files, everything else in the metadata"""
+        arrays, values = {}, {}
+        for name, value in result.items():
+            if isinstance(value, np.ndarray):
+                _write_array(os.path.join(self.directory, name + ".npy"), value)
+                arrays[name] = list(value.shape)
+            else:
+                values[name] = _plain(value)
+        self.meta.update(arrays=arrays, values=values, complete=True, finished=time.time())
+        self._save()
+    
+    def load_result(self):
+        """Stored result dict with its arrays memory-mapped read-only"""
+        result = dict(self.meta["values"])
+        for name in self.meta["arrays"]:
+            result[name] = np.load(os.path.join(self.directory, name + ".npy"), mmap_mode="r")
+        return result
+    
+    def _save(self):
+        _write_json(os.path.join(self.directory, META_FILE), self.meta)
+
+
+def _plain(value):
+    """JSON-safe version of a scalar, dict or list result value"""
+    if isinstance(value, dict):
+        return {name: _plain(v) for name, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class ResultStore:
+    """Directory of stored runs, one per stage and hash of the Config fields it reads
+    
+    The key includes SEED, so a seeded run maps to the same directory after
+    a restart. There is no shared index file: runs() lists the runs from
+    their own run.json files, so pool workers writing different runs at
+    once never touch the same file.
+    """
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+    
+    def open_run(self, stage, config):
+        """Stored run for this stage and config, created empty if absent"""
+        key = config_fingerprint(config, STAGE_FIELDS[stage])
+        directory = os.path.join(self.root, stage, key)
+        meta = _read_json(os.path.join(directory, META_FILE), None)
+        if meta is None:
+            os.makedirs(directory, exist_ok=True)
+            entropy = config.SEED if config.SEED is not None else np.random.SeedSequence().entropy
+            meta = {
+                "stage": stage,
+                "config": canonical_config(config, STAGE_FIELDS[stage]),
+                # Kept as a string: fresh entropy is a 128-bit integer
+                "entropy": str(entropy),
+                "points": {},
+                "arrays": {},
+                "values": {},
+                "complete": False,
+                "started": time.time(),
+            }
+        run = StoredRun(self, stage, key, directory, meta)
+        run.meta["entropy"] = str(run.meta["entropy"])
+        return run
+    
+    def find(self, stage, config):
+        """Completed stored run for this stage and config, or None"""
+        run = self.open_run(stage, config) if self.has_run(stage, config) else None
+        return run if run is not None and run.complete else None
+    
+    def has_run(self, stage, config):
+        key = config_fingerprint(config, STAGE_FIELDS[stage])
+        return os.path.exists(os.path.join(self.root, stage, key, META_FILE))
+    
+    def runs(self, stage=None, complete=True):
+        """Stored runs, newest first, optionally filtered by stage and completion
+        
+        Each entry holds the run's stage, key, config, number of recorded
+        points, completion flag and start time.
+        """
+        entries = []
+        stages = [stage] if stage is not None else sorted(os.listdir(self.root))
+        for name in stages:
+            stage_dir = os.path.join(self.root, name)
+            if not os.path.isdir(stage_dir):
+                continue
+            for key in sorted(os.listdir(stage_dir)):
+                meta = _read_json(os.path.join(stage_dir, key, META_FILE), None)
+                if meta is None or (complete and not meta["complete"]):
+                    continue
+                entries.append({
+                    "stage": meta["stage"],
+                    "key": key,
+                    "config": meta["config"],
+                    "points": len(meta["points"]),
+                    "complete": meta["complete"],
+                    "started": meta["started"],
+                })
+        return sorted(entries, key=lambda e: e["started"], reverse=True)
+    
+    def load(self, stage, key):
+        """Memory-mapped result of a stored run picked from runs()"""
+        directory = os.path.join(self.root, stage, key)
+        meta = _read_json(os.path.join(directory, META_FILE), None)
+        if meta is None:
+            raise KeyError(f"No stored {stage} run {key}")
+        return StoredRun(self, stage, key, directory, meta).load_result()
\ No newline at end of file
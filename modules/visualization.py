@@ -1,4 +1,6 @@
 import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+from matplotlib.ticker import MaxNLocator
 import numpy as np
 from io import BytesIO
 import base64
@@ -78,6 +80,100 @@ class Visualizer:
         
         return f"data:image/png;base64,{img_str}"
     
+    def plot_spectrum(self, freqs, psd, symbol_rate=None, occupied_bandwidth=None):
+        """Plot the power spectral density of the transmitted signal"""
+        fig, ax = plt.subplots(figsize=(12, 6))
+        psd_db = 10 * np.log10(psd / np.max(psd) + 1e-12)
+        ax.plot(freqs / 1e6, psd_db, 'b-', linewidth=1.5, label='PSD')
+        
+        if symbol_rate is not None:
+            for edge in (-symbol_rate / 2, symbol_rate / 2):
+                ax.axvline(edge / 1e6, color='black', linestyle='--', linewidth=0.8)
+        if occupied_bandwidth is not None:
+            ax.axvspan(-occupied_bandwidth / 2e6, occupied_bandwidth / 2e6, color='green', alpha=0.1,
+                       label=f'Occupied BW ({occupied_bandwidth / 1e6:.2f} MHz)')
+        
+        ax.set_ylim(-80, 5)
+        ax.grid(True, alpha=0.3)
+        ax.set_xlabel('Frequency (MHz)')
+        ax.set_ylabel('Relative PSD (dB)')
+        ax.set_title('Transmit Spectrum')
+        ax.legend()
+        
+        # Convert to base64 for Streamlit
+        buf = BytesIO()
+        fig.savefig(buf, format="png", dpi=100, bbox_inches='tight')
+        buf.seek(0)
+        img_str = base64.b64encode(buf.read()).decode()
+        plt.close(fig)
+        
+        return f"data:image/png;base64,{img_str}"
+    
+    def _draw_density(self, ax, histogram, reference=None, title="Received Constellation Density"):
+        counts = np.ma.masked_equal(histogram.counts, 0)
+        image = ax.imshow(counts, origin='lower', cmap='viridis', interpolation='nearest',
+                          norm=LogNorm(vmin=1, vmax=max(int(histogram.counts.max()), 1)),
+                          extent=(-histogram.extent, histogram.extent, -histogram.extent, histogram.extent))
+        if reference is not None:
+            ax.scatter(np.real(reference), np.imag(reference), marker='x', color='red', s=60, label='Ideal')
+            ax.legend(loc='upper right')
+        ax.axhline(0, color='white', linestyle='--', linewidth=0.5)
+        ax.axvline(0, color='white', linestyle='--', linewidth=0.5)
+        ax.set_title(f"{title} ({histogram.total:,} symbols)")
+        ax.set_xlabel('In-phase')
+        ax.set_ylabel('Quadrature')
+        ax.set_aspect('equal')
+        return image
+    
+    def plot_constellation_density(self, histogram, reference=None, title="Received Constellation Density"):
+        """Plot a ConstellationHistogram as a log-scaled heatmap
+        
+        Cost depends on the bin count only, not on how many symbols were binned.
+        """
+        fig, ax = plt.subplots(figsize=(8, 8))
+        image = self._draw_density(ax, histogram, reference, title)
+        fig.colorbar(image, ax=ax, label='Symbols per bin', shrink=0.8)
+        
+        # Convert to base64 for Streamlit
+        buf = BytesIO()
+        fig.savefig(buf, format="png", dpi=100, bbox_inches='tight')
+        buf.seek(0)
+        img_str = base64.b64encode(buf.read()).decode()
+        plt.close(fig)
+        
+        return f"data:image/png;base64,{img_str}"
+    
+    def plot_comparison_density(self, transmitted, histogram):
+        """Ideal transmitted points next to the received-symbol density"""
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+        
+        # Transmitted constellation
+        ax1.scatter(np.real(transmitted), np.imag(transmitted), alpha=0.6, color='blue')
+        ax1.axhline(0, color='black', linestyle='--', linewidth=0.5)
+        ax1.axvline(0, color='black', linestyle='--', linewidth=0.5)
+        ax1.grid(True, alpha=0.3)
+        ax1.set_title('Transmitted Constellation')
+        ax1.set_xlabel('In-phase')
+        ax1.set_ylabel('Quadrature')
+        ax1.set_xlim(-histogram.extent, histogram.extent)
+        ax1.set_ylim(-histogram.extent, histogram.extent)
+        ax1.set_aspect('equal')
+        
+        # Received density
+        image = self._draw_density(ax2, histogram, transmitted)
+        fig.colorbar(image, ax=ax2, label='Symbols per bin', shrink=0.8)
+        
+        plt.tight_layout()
+        
+        # Convert to base64 for Streamlit
+        buf = BytesIO()
+        fig.savefig(buf, format="png", dpi=100, bbox_inches='tight')
+        buf.seek(0)
+        img_str = base64.b64encode(buf.read()).decode()
+        plt.close(fig)
+        
+        return f"data:image/png;base64,{img_str}"
+    
     def plot_comparison_constellation(self, transmitted, received):
         """Plot comparison of transmitted and received constellations"""
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
@@ -111,4 +207,101 @@ class Visualizer:
         img_str = base64.b64encode(buf.read()).decode()
         plt.close(fig)
         
+        return f"data:image/png;base64,{img_str}"
+    
+    def plot_pass(self, pass_results):
+        """Plot elevation, Eb/N0 margin and Doppler over a satellite pass"""
+        t = pass_results['time'] / 60
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+        
+        ax1.plot(t, pass_results['link_margin'], 'b-', linewidth=2, label='Link Margin')
+        ax1.axhline(0, color='black', linestyle='--', linewidth=0.5)
+        ax1.fill_between(t, 0, 1, where=pass_results['usable'], color='green', alpha=0.15,
+                         transform=ax1.get_xaxis_transform(), label='Usable')
+        ax1.set_ylabel('Link Margin (dB)')
+        ax1.grid(True, alpha=0.3)
+        ax1.legend(loc='upper left')
+        ax1b = ax1.twinx()
+        ax1b.plot(t, pass_results['elevation'], 'r--', linewidth=1, label='Elevation')
+        ax1b.set_ylabel('Elevation (deg)')
+        ax1.set_title('Link Margin over Pass')
+        
+        ax2.plot(t, pass_results['doppler'] / 1e3, 'm-', linewidth=2)
+        ax2.set_xlabel('Time (min)')
+        ax2.set_ylabel('Doppler Shift (kHz)')
+        ax2.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        
+        # Convert to base64 for Streamlit
+        buf = BytesIO()
+        fig.savefig(buf, format="png", dpi=100, bbox_inches='tight')
+        buf.seek(0)
+        img_str = base64.b64encode(buf.read()).decode()
+        plt.close(fig)
+        
+        return f"data:image/png;base64,{img_str}"
+    
+    def plot_acm(self, time, esn0_db, acm_results):
+        """Plot Es/N0 and the information rate chosen by ACM over time"""
+        t = np.asarray(time) / 60
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+        
+        ax1.plot(t, esn0_db, 'b-', linewidth=2)
+        ax1.fill_between(t, 0, 1, where=acm_results['modcod'] < 0, color='red', alpha=0.15,
+                         transform=ax1.get_xaxis_transform(), label='Outage')
+        ax1.set_ylabel('Es/N₀ (dB)')
+        ax1.set_title('Adaptive Coding and Modulation')
+        ax1.grid(True, alpha=0.3)
+        ax1.legend(loc='upper left')
+        
+        ax2.step(t, acm_results['rate'] / 1e6, 'g-', where='post', linewidth=2)
+        ax2.set_xlabel('Time (min)')
+        ax2.set_ylabel('Information Rate (Mbit/s)')
+        ax2.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        
+        # Convert to base64 for Streamlit
+        buf = BytesIO()
+        fig.savefig(buf, format="png", dpi=100, bbox_inches='tight')
+        buf.seek(0)
+        img_str = base64.b64encode(buf.read()).decode()
+        plt.close(fig)
+        
+        return f"data:image/png;base64,{img_str}"
+    
+    def plot_network(self, network_results):
+        """Plot simulated and theoretical BER and the link margin of every link"""
+        links = np.arange(len(network_results['ber']))
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+        
+        # Links without errors have no point on the log axis
+        ber = np.where(network_results['errors'] > 0, network_results['ber'], np.nan)
+        ax1.semilogy(links, ber, 'bo', label='Simulated BER')
+        ax1.semilogy(links, network_results['theoretical_ber'], 'r_', markersize=12, label='Theoretical BER (uncoded)')
+        # Below one error in the bits sent per link the simulation cannot resolve anything
+        ax1.set_ylim(0.1 / np.max(network_results['bits']), 1)
+        ax1.set_ylabel('Bit Error Rate (BER)')
+        ax1.set_title('Per-Link Performance')
+        ax1.grid(True, which="both", ls="-", alpha=0.3)
+        ax1.legend()
+        
+        margin = network_results['link_margin']
+        ax2.bar(links, margin, color=np.where(margin >= 0, 'green', 'red'))
+        ax2.axhline(0, color='black', linestyle='--', linewidth=0.5)
+        ax2.xaxis.set_major_locator(MaxNLocator(integer=True))
+        ax2.set_xlabel('Link')
+        ax2.set_ylabel('Link Margin (dB)')
+        ax2.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        
+        # Convert to base64 for Streamlit
+        buf = BytesIO()
+        fig.savefig(buf, format="png", dpi=100, bbox_inches='tight')
+        buf.seek(0)
+        img_str = base64.b64encode(buf.read()).decode()
+        plt.close(fig)
+        
         return f"data:image/png;base64,{img_str}"
\ No newline at end of file